@@ -1,4 +1,13 @@
+import heapq
+import sys
+import time
+import tracemalloc
+from array import array
+
+
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -46,34 +55,110 @@ class LinkedList:
         self.tail = old_head
 
     # --- Сортування злиттям ---
-    def sort(self):
-        """Публічний метод: відсортувати список злиттям. Міняє head лише один раз."""
-        self.head = self._merge_sort(self.head)
-        self._recompute_tail()
-
-    def _merge_sort(self, head):
-        if head is None or head.next is None:
-            return head
-        mid = self._get_middle(head)
-        right = mid.next
-        mid.next = None  # розрізаємо список на [head..mid] і [right..]
-        left_sorted = self._merge_sort(head)
-        right_sorted = self._merge_sort(right)
-        return self._sorted_merge_iter(left_sorted, right_sorted)
+    def sort(self, key=None, reverse=False):
+        """
+        Природне висхідне сортування злиттям (без рекурсії), стабільне, з key= і reverse=
+        як у list.sort. Готові неспадні серії (і строго спадні — після розвороту)
+        використовуються як є, тож майже відсортований список сортується за O(n).
+        """
+        if self.head is None or self.head.next is None:
+            return
+        if key is not None:
+            # ключі рахуються до будь-яких змін: якщо key впаде, список лишиться недоторканим
+            nodes, keys = [], []
+            cur = self.head
+            while cur:
+                nodes.append(cur)
+                keys.append(key(cur.data))
+                cur = cur.next
+        # reverse=True стабільно зводиться до: розвернути, відсортувати за зростанням, розвернути
+        if reverse:
+            self.reverse()
+        if key is None:
+            self._natural_merge_sort()
+        else:
+            # на час сортування data підмінюється ключем (key рахується раз на вузол)
+            originals = [node.data for node in nodes]
+            for node, k in zip(nodes, keys):
+                node.data = k
+            try:
+                self._natural_merge_sort()
+            finally:
+                for node, value in zip(nodes, originals):
+                    node.data = value
+        if reverse:
+            self.reverse()
+
+    def _natural_merge_sort(self):
+        """
+        Серії зливаються зі стеку за інваріантами TimSort: для трьох верхніх довжин
+        A > B + C і B > C. Довжини на стеку ростуть не повільніше за числа Фібоначчі,
+        тож глибина стеку — O(log n), а сумарна вартість злиттів — O(n log n).
+        tail відстежується під час злиття, окремий прохід не потрібен.
+        """
+        stack = []  # серії (head, tail, довжина)
+        cur = self.head
+        while cur:
+            run_head, run_tail, length, cur = self._next_run(cur)
+            stack.append((run_head, run_tail, length))
+            self._merge_collapse(stack)
+        while len(stack) >= 2:
+            self._merge_at(stack, len(stack) - 2)
+        self.head, self.tail, _ = stack[0]
+
+    @classmethod
+    def _merge_collapse(cls, stack):
+        """Відновлює інваріанти стеку серій (як merge_collapse у CPython listsort)."""
+        while len(stack) >= 2:
+            n = len(stack) - 2
+            if (n > 0 and stack[n - 1][2] <= stack[n][2] + stack[n + 1][2]) or \
+                    (n > 1 and stack[n - 2][2] <= stack[n - 1][2] + stack[n][2]):
+                if stack[n - 1][2] < stack[n + 1][2]:
+                    n -= 1
+            elif stack[n][2] > stack[n + 1][2]:
+                break
+            cls._merge_at(stack, n)
+
+    @classmethod
+    def _merge_at(cls, stack, i):
+        """Зливає сусідні серії stack[i] і stack[i + 1] (порядок серій зберігається — стабільно)."""
+        a_head, a_tail, a_len = stack[i]
+        b_head, b_tail, b_len = stack[i + 1]
+        head, tail = cls._merge_runs(a_head, a_tail, b_head, b_tail)
+        stack[i:i + 2] = [(head, tail, a_len + b_len)]
 
     @staticmethod
-    def _get_middle(head):
-        """Повертає середній вузол (нижня середина)."""
-        slow = head
-        fast = head
-        while fast.next and fast.next.next:
-            slow = slow.next
-            fast = fast.next.next
-        return slow
+    def _next_run(node):
+        """
+        Відрізає від node серію: найдовшу неспадну або строго спадну (її розвертає).
+        Повертає (head серії, tail серії, довжина, перший вузол після серії).
+        """
+        head = node
+        length = 1
+        nxt = node.next
+        if nxt is not None and nxt.data < node.data:
+            while nxt is not None and nxt.data < node.data:
+                node = nxt
+                nxt = nxt.next
+                length += 1
+            # розворот строго спадної серії head..node
+            prev, cur = None, head
+            while cur is not nxt:
+                following = cur.next
+                cur.next = prev
+                prev = cur
+                cur = following
+            return node, head, length, nxt
+        while nxt is not None and node.data <= nxt.data:
+            node = nxt
+            nxt = nxt.next
+            length += 1
+        node.next = None
+        return head, node, length, nxt
 
     @staticmethod
-    def _sorted_merge_iter(a, b):
-        """Ітеративне злиття двох відсортованих списків"""
+    def _merge_runs(a, a_tail, b, b_tail):
+        """Стабільне злиття двох серій; повертає (head, tail) без дообходу залишку."""
         dummy = Node(0)
         tail = dummy
         while a and b:
@@ -84,18 +169,11 @@ class LinkedList:
                 tail.next = b
                 b = b.next
             tail = tail.next
-        tail.next = a if a else b
-        return dummy.next
-
-    def _recompute_tail(self):
-        """Оновити tail відповідно до поточного head."""
-        cur = self.head
-        if cur is None:
-            self.tail = None
-            return
-        while cur.next:
-            cur = cur.next
-        self.tail = cur
+        if a:
+            tail.next = a
+            return dummy.next, a_tail
+        tail.next = b
+        return dummy.next, (b_tail if b else tail)
 
     # --- Злиття двох відсортованих списків ---
     @staticmethod
@@ -104,14 +182,287 @@ class LinkedList:
         Зливає два ВІДСОРТОВАНІ LinkedList в один новий відсортований.
         Використовує наявні вузли (вхідні списки де-факто «споживаються»).
         """
-        head = LinkedList._sorted_merge_iter(list1.head, list2.head)
         merged = LinkedList()
-        merged.head = head
-        merged._recompute_tail()
+        if list1.head is None or list2.head is None:
+            source = list1 if list1.head is not None else list2
+            merged.head, merged.tail = source.head, source.tail
+            return merged
+        merged.head, merged.tail = LinkedList._merge_runs(list1.head, list1.tail, list2.head, list2.tail)
+        return merged
+
+    # --- K-шляхове злиття ---
+    @staticmethod
+    def _iter_nodes(source):
+        """Вузли LinkedList (наступний читається до yield — вузол можна перепідʼєднати) або нові Node з ітератора."""
+        if isinstance(source, LinkedList):
+            cur = source.head
+            while cur:
+                nxt = cur.next
+                yield cur
+                cur = nxt
+        else:
+            for x in source:
+                yield Node(x)
+
+    @staticmethod
+    def _iter_values(source):
+        if isinstance(source, LinkedList):
+            cur = source.head
+            while cur:
+                yield cur.data
+                cur = cur.next
+        else:
+            yield from source
+
+    @staticmethod
+    def merge_sorted(*sources, key=None, lazy=False):
+        """
+        K-шляхове злиття через купу довжини k: sources — відсортовані LinkedList
+        та/або будь-які відсортовані ітератори. Стабільне: за рівності першим іде
+        елемент з джерела, переданого раніше.
+          lazy=False — новий LinkedList; вузли вхідних LinkedList перепідʼєднуються
+                       (ці списки «споживаються»), для ітераторів створюються нові Node
+          lazy=True  — генератор значень без побудови списку (O(k) пам'яті)
+        """
+        if lazy:
+            return heapq.merge(*(LinkedList._iter_values(src) for src in sources), key=key)
+
+        iters = [LinkedList._iter_nodes(src) for src in sources]
+        heap = []
+        for i, it in enumerate(iters):
+            node = next(it, None)
+            if node is not None:
+                heap.append((node.data if key is None else key(node.data), i, node))
+        heapq.heapify(heap)
+
+        merged = LinkedList()
+        dummy = Node(0)
+        tail = dummy
+        while heap:
+            _, i, node = heap[0]
+            nxt = next(iters[i], None)
+            if nxt is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (nxt.data if key is None else key(nxt.data), i, nxt))
+            tail.next = node
+            tail = node
+        tail.next = None
+        if tail is not dummy:
+            merged.head, merged.tail = dummy.next, tail
+        return merged
+
+
+def iter_sorted_file(path, parse=int):
+    """Лінивий читач відсортованого файлу-серії: одне значення на рядок."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield parse(line)
+
+
+def merge_sorted_files(paths, out_path, parse=int, key=None):
+    """
+    Зовнішнє злиття відсортованих серій на диску: у пам'яті лише по одному
+    значенню з кожного файлу. Пише результат у out_path, повертає кількість значень.
+    """
+    count = 0
+    merged = LinkedList.merge_sorted(*(iter_sorted_file(p, parse) for p in paths), key=key, lazy=True)
+    with open(out_path, "w", encoding="utf-8") as out:
+        for value in merged:
+            out.write(f"{value}\n")
+            count += 1
+    return count
+
+
+class ArrayLinkedList:
+    """
+    Той самий API, що й LinkedList, але вузли — це індекси в паралельних буферах
+    array: data[i] — значення, next[i] — індекс наступного вузла (-1 — кінець).
+    Звільнені remove() комірки утворюють free list і повторно використовуються append().
+    typecode — тип елементів array ('q' — цілі, 'd' — дійсні).
+    """
+    NIL = -1
+
+    def __init__(self, iterable=None, typecode="q"):
+        self.typecode = typecode
+        self.data = array(typecode)
+        self.next = array("q")
+        self.head = self.NIL
+        self.tail = self.NIL
+        self._free = self.NIL
+        self._size = 0
+        if iterable:
+            self.extend(iterable)
+
+    def __len__(self):
+        return self._size
+
+    def _alloc(self, data):
+        if self._free != self.NIL:
+            i = self._free
+            self._free = self.next[i]
+            self.data[i] = data
+            self.next[i] = self.NIL
+            return i
+        self.data.append(data)
+        self.next.append(self.NIL)
+        return len(self.next) - 1
+
+    def append(self, data):
+        """Додає елемент у кінець за O(1) завдяки tail."""
+        i = self._alloc(data)
+        if self.head == self.NIL:
+            self.head = self.tail = i
+        else:
+            self.next[self.tail] = i
+            self.tail = i
+        self._size += 1
+
+    def extend(self, iterable):
+        """
+        Масове додавання: значення дописуються в кінець буферів одним extend,
+        а next заповнюється послідовними індексами (free list при цьому не використовується).
+        """
+        # спершу збираємо значення в окремий масив: якщо якесь не підходить під typecode,
+        # виняток вилетить до зміни data/next і буфери не розсинхронізуються
+        values = array(self.typecode, iterable)
+        count = len(values)
+        start = len(self.data)
+        self.data.extend(values)
+        if count == 0:
+            return
+        self.next.extend(range(start + 1, start + count + 1))
+        self.next[-1] = self.NIL
+        if self.head == self.NIL:
+            self.head = start
+        else:
+            self.next[self.tail] = start
+        self.tail = start + count - 1
+        self._size += count
+
+    def remove(self, data):
+        """Видаляє перше входження data; комірка повертається у free list."""
+        prev, cur = self.NIL, self.head
+        while cur != self.NIL and self.data[cur] != data:
+            prev, cur = cur, self.next[cur]
+        if cur == self.NIL:
+            raise ValueError(f"{data!r} відсутній у списку")
+        nxt = self.next[cur]
+        if prev == self.NIL:
+            self.head = nxt
+        else:
+            self.next[prev] = nxt
+        if cur == self.tail:
+            self.tail = prev
+        self.next[cur] = self._free
+        self._free = cur
+        self._size -= 1
+
+    def _indices(self):
+        nxt = self.next
+        cur = self.head
+        while cur != self.NIL:
+            yield cur
+            cur = nxt[cur]
+
+    def to_list(self):
+        data = self.data
+        return [data[i] for i in self._indices()]
+
+    def print_list(self):
+        print(" -> ".join(map(str, self.to_list())) or "(порожньо)")
+
+    def reverse(self):
+        """Ітеративний реверс: перелінковує індекси next."""
+        nxt = self.next
+        prev = self.NIL
+        cur = self.head
+        old_head = self.head
+        while cur != self.NIL:
+            following = nxt[cur]
+            nxt[cur] = prev
+            prev = cur
+            cur = following
+        self.head = prev
+        self.tail = old_head
+
+    def sort(self, key=None, reverse=False):
+        """
+        Стабільне сортування з key= і reverse= як у LinkedList.sort: значення збираються
+        в порядку списку, сортуються і записуються назад у ті самі комірки — посилання next
+        не змінюються. Якщо key впаде, список лишиться недоторканим.
+        """
+        indices = list(self._indices())
+        values = sorted((self.data[i] for i in indices), key=key, reverse=reverse)
+        data = self.data
+        for i, v in zip(indices, values):
+            data[i] = v
+
+    @staticmethod
+    def merge_two_sorted_lists(list1, list2):
+        """
+        Зливає два ВІДСОРТОВАНІ ArrayLinkedList в один новий відсортований
+        (при рівності першим іде елемент list1). Вузли з різних пулів не можна
+        перепідʼєднати, тож значення копіюються в новий пул; вхідні списки не змінюються.
+        """
+        merged = ArrayLinkedList(typecode=list1.typecode)
+        a, b = list1._indices(), list2._indices()
+        ia, ib = next(a, None), next(b, None)
+        while ia is not None and ib is not None:
+            if list1.data[ia] <= list2.data[ib]:
+                merged.append(list1.data[ia])
+                ia = next(a, None)
+            else:
+                merged.append(list2.data[ib])
+                ib = next(b, None)
+        while ia is not None:
+            merged.append(list1.data[ia])
+            ia = next(a, None)
+        while ib is not None:
+            merged.append(list2.data[ib])
+            ib = next(b, None)
         return merged
 
 
+def benchmark_backends(n=1_000_000):
+    """Порівнює пам'ять і час LinkedList та ArrayLinkedList на n цілих."""
+    print(f"Бенчмарк бекендів ({n:,} елементів):")
+    print("| {:>15} | {:>11} | {:>9} | {:>10} | {:>10} | {:>7} |".format(
+        "бекенд", "пам'ять, МБ", "append, с", "to_list, с", "reverse, с", "sort, с"))
+    print(f"|{'-' * 17}|{'-' * 13}|{'-' * 11}|{'-' * 12}|{'-' * 12}|{'-' * 9}|")
+    values = list(range(n, 0, -1))
+    for cls in (LinkedList, ArrayLinkedList):
+        tracemalloc.start()
+        ll = cls(values)
+        memory = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        del ll
+
+        t0 = time.perf_counter()
+        ll = cls(values)
+        t_append = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ll.to_list()
+        t_to_list = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ll.reverse()
+        t_reverse = time.perf_counter() - t0
+        ll.reverse()
+        t0 = time.perf_counter()
+        ll.sort()
+        t_sort = time.perf_counter() - t0
+        print(f"| {cls.__name__:>15} | {memory:11.1f} | {t_append:9.3f} | {t_to_list:10.3f} | "
+              f"{t_reverse:10.3f} | {t_sort:7.3f} |")
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_backends()
+        sys.exit(0)
+
     ll = LinkedList([3, 1, 4, 2])
     print("Оригінальний список:")
     ll.print_list()
@@ -132,3 +483,7 @@ if __name__ == "__main__":
     print("\nЗлитий відсортований список:")
     merged = LinkedList.merge_two_sorted_lists(ll, ll2)
     merged.print_list()
+
+    print("\nK-шляхове злиття (списки та ітератори):")
+    shards = [LinkedList([1, 4, 9]), LinkedList([2, 3, 10]), range(0, 12, 5)]
+    LinkedList.merge_sorted(*shards).print_list()
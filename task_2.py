@@ -1,58 +1,249 @@
-import turtle
+import argparse
 import math
+import os
+import struct
+import turtle
+import zlib
+
+import numpy as np
 
 ANGLE_DEG = 45
 SCALE = math.sqrt(2)/2
 
+# Максимальний рівень: turtle-бекенд малює повільно, тож вище за TURTLE_MAX_LEVEL — лише у файл
+MAX_LEVEL = 64
+TURTLE_MAX_LEVEL = 14
+
+TRUNK_LENGTH = 140
+ORIGIN = (0.0, -320.0)
+CANVAS_SIZE = 900
+
+
+# Найбільший розмір масиву відрізків за раз; глибші рівні обробляються піддеревами
+CHUNK_SEGMENTS = 1 << 16
+
+# Піддерева з гілкою, коротшою за стільки пікселів, не малюються (level-of-detail)
+PIXEL_THRESHOLD = 0.5
+
+
+def branch_levels(length: float, level: int, max_level: int = None,
+                  origin=ORIGIN, heading_deg: float = 90.0,
+                  angle_deg: float = ANGLE_DEG, scale: float = SCALE,
+                  min_length: float = 0.0, chunk_size: int = CHUNK_SEGMENTS, stats: dict = None):
+    """
+    Геометрія дерева Піфагора без рекурсії. Повертає потік блоків
+    (x0, y0, x1, y1, shade) — NumPy-масиви відрізків однієї глибини і відтінок зеленого.
+    Наступна глибина будується векторно: кінці відрізків стають початками,
+    напрямки повертаються на ±angle_deg, довжина множиться на scale.
+    Блоки не перевищують chunk_size (більші рівні діляться на піддерева, обхід —
+    у глибину стеком), тож пам'ять обмежена навіть для рівнів > 20.
+    Піддерева, чия гілка коротша за min_length, відкидаються цілком; якщо передано
+    stats, після вичерпання потоку туди пишуться "emitted" і "culled" — кількість
+    намальованих і відкинутих відрізків.
+    """
+    if max_level is None:
+        max_level = level
+    angle = math.radians(angle_deg)
+    emitted = culled = 0
+    stack = [(np.array([float(origin[0])]), np.array([float(origin[1])]),
+              np.array([math.radians(heading_deg)]), float(length), 0)]
+    while stack:
+        x, y, heading, seg_len, depth = stack.pop()
+        if depth == level:
+            continue
+        if seg_len < min_length:
+            # усе піддерево (2^(level-depth) - 1 відрізків на кожен корінь) дрібніше за поріг
+            culled += len(x) * ((1 << (level - depth)) - 1)
+            continue
+
+        x1 = x + seg_len * np.cos(heading)
+        y1 = y + seg_len * np.sin(heading)
+        remaining = level - depth
+        shade = int(200 * (max_level - remaining) / max_level) + 55
+        emitted += len(x)
+        yield x, y, x1, y1, shade
+
+        # кожен відрізок породжує двох нащадків: ліворуч (+кут) і праворуч (-кут)
+        cx = np.repeat(x1, 2)
+        cy = np.repeat(y1, 2)
+        ch = np.repeat(heading, 2)
+        ch[0::2] += angle
+        ch[1::2] -= angle
+        # у стек у зворотному порядку, щоб першим обробився перший блок
+        for lo in reversed(range(0, len(cx), chunk_size)):
+            stack.append((cx[lo:lo + chunk_size], cy[lo:lo + chunk_size], ch[lo:lo + chunk_size],
+                          seg_len * scale, depth + 1))
+    if stats is not None:
+        stats["emitted"], stats["culled"] = emitted, culled
+
+
+# --- Бекенди ---
+def render_turtle(t: turtle.Turtle, levels) -> None:
+    """Малює відрізки черепашкою: лише goto між кінцями, без setheading і рекурсії."""
+    for x0, y0, x1, y1, shade in levels:
+        t.pencolor(0, shade, 0)
+        for ax, ay, bx, by in zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()):
+            t.penup(); t.goto(ax, ay); t.pendown(); t.goto(bx, by)
+
+
 def draw_branch(t: turtle.Turtle, length: float, level: int, max_level: int):
+    """Сумісна обгортка: малює дерево з поточної позиції та напрямку черепашки."""
     if level == 0:
         return
-
-    shade = int(200 * (max_level - level) / max_level) + 55
-    t.pencolor(0, shade, 0)
-
-    t.forward(length)
-
-    pos = t.pos()
-    heading = t.heading()
-
-    t.left(ANGLE_DEG)
-    draw_branch(t, length * SCALE, level - 1, max_level)
-
+    pos, heading = t.pos(), t.heading()
+    render_turtle(t, branch_levels(length, level, max_level, origin=pos, heading_deg=heading))
     t.penup(); t.setpos(pos); t.setheading(heading); t.pendown()
 
-    t.right(ANGLE_DEG)
-    draw_branch(t, length * SCALE, level - 1, max_level)
 
-    t.penup(); t.setpos(pos); t.setheading(heading); t.pendown()
+def render_matplotlib(levels, path: str = None, size: int = CANVAS_SIZE) -> None:
+    """
+    Малює відрізки як matplotlib LineCollection (по одній на глибину).
+    Якщо path задано (.png/.svg/...), зберігає у файл без вікна.
+    """
+    import matplotlib
+    if path is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    fig, ax = plt.subplots(figsize=(size / 100, size / 100), dpi=100)
+    for x0, y0, x1, y1, shade in levels:
+        segments = np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1)
+        width = 2 if len(x0) < 4096 else 0.5
+        ax.add_collection(LineCollection(segments, colors=[(0, shade / 255, 0)], linewidths=width))
+    half = size / 2
+    ax.set_xlim(-half, half)
+    ax.set_ylim(-half, half)
+    ax.set_aspect("equal")
+    ax.set_axis_off()
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path)
+        plt.close(fig)
+
+
+def render_svg(levels, path: str, size: int = CANVAS_SIZE) -> None:
+    """Пише SVG напряму: один <path> на глибину, координати turtle → SVG (вісь y вниз)."""
+    half = size / 2
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+                f'viewBox="0 0 {size} {size}">\n<rect width="100%" height="100%" fill="white"/>\n')
+        for x0, y0, x1, y1, shade in levels:
+            coords = np.column_stack([x0 + half, half - y0, x1 + half, half - y1])
+            d = " ".join(f"M{a:.1f} {b:.1f}L{c:.1f} {e:.1f}" for a, b, c, e in coords.tolist())
+            f.write(f'<path stroke="rgb(0,{shade},0)" stroke-width="{2 if len(x0) < 4096 else 0.5}" '
+                    f'fill="none" d="{d}"/>\n')
+        f.write("</svg>\n")
+
+
+def rasterize(levels, size: int = CANVAS_SIZE) -> np.ndarray:
+    """
+    Растеризує відрізки в RGB-масив size×size: точки вздовж усіх відрізків глибини
+    обчислюються векторно (усі відрізки однієї глибини мають однакову довжину).
+    """
+    img = np.full((size, size, 3), 255, dtype=np.uint8)
+    half = size / 2
+    for x0, y0, x1, y1, shade in levels:
+        seg_len = math.hypot(x1[0] - x0[0], y1[0] - y0[0])
+        t = np.linspace(0.0, 1.0, max(2, int(math.ceil(seg_len)) + 1))
+        px = np.rint(x0[:, None] + (x1 - x0)[:, None] * t + half).astype(np.int64).ravel()
+        py = np.rint(half - (y0[:, None] + (y1 - y0)[:, None] * t)).astype(np.int64).ravel()
+        inside = (px >= 0) & (px < size) & (py >= 0) & (py < size)
+        img[py[inside], px[inside]] = (0, shade, 0)
+    return img
+
+
+def write_png(path: str, img: np.ndarray) -> None:
+    """Мінімальний PNG-кодер (RGB, 8 біт) на zlib, без сторонніх бібліотек."""
+    height, width, _ = img.shape
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), img.reshape(height, -1)]).tobytes()
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def render_png(levels, path: str, size: int = CANVAS_SIZE) -> None:
+    """Растеризує відрізки й зберігає PNG — працює без дисплея."""
+    write_png(path, rasterize(levels, size))
+
+
+def render_sweep(angles, scales, level: int, out_dir: str = ".", fmt: str = "png",
+                 pixel_threshold: float = PIXEL_THRESHOLD):
+    """
+    Пакетний рендер для перебору параметрів: по файлу на кожну пару (angle, scale).
+    Повертає список (шлях, stats) зі статистикою намальованих/відкинутих відрізків.
+    """
+    render = {"png": render_png, "svg": render_svg}[fmt]
+    results = []
+    for angle in angles:
+        for scale in scales:
+            stats = {}
+            path = os.path.join(out_dir, f"pythagoras_a{angle:g}_s{scale:.3f}_l{level}.{fmt}")
+            render(branch_levels(TRUNK_LENGTH, level, angle_deg=angle, scale=scale,
+                                 min_length=pixel_threshold, stats=stats), path)
+            results.append((path, stats))
+    return results
+
 
 def main():
-    try:
-        level = int(input("Вкажіть рівень рекурсії (1–12): ").strip())
-    except Exception:
-        level = 8
-    level = max(1, min(level, 12))
-
-    screen = turtle.Screen()
-    screen.title("Фрактал: Дерево Піфагора (рекурсія)")
-    screen.bgcolor("white")
-    screen.setup(width=900, height=900)
-    screen.colormode(255)
-
-    t = turtle.Turtle(visible=False)
-    t.pensize(2)
-    t.speed(0)
-    turtle.tracer(0, 0)
-
-    t.penup()
-    t.goto(0, -320)
-    t.setheading(90)
-    t.pendown()
-
-    draw_branch(t, length=140, level=level, max_level=level)
-
-    turtle.update()
-    screen.mainloop()
+    parser = argparse.ArgumentParser(description="Фрактал: Дерево Піфагора")
+    parser.add_argument("--level", type=int, help=f"рівень рекурсії (1–{MAX_LEVEL})")
+    parser.add_argument("--angle", type=float, default=ANGLE_DEG, help="кут розгалуження, градуси")
+    parser.add_argument("--scale", type=float, default=SCALE, help="коефіцієнт зменшення гілки")
+    parser.add_argument("--threshold", type=float, default=PIXEL_THRESHOLD,
+                        help="не малювати піддерева з гілкою, коротшою за стільки пікселів")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--png", metavar="PATH")
+    output.add_argument("--svg", metavar="PATH")
+    output.add_argument("--mpl", metavar="PATH", nargs="?", const="")
+    args = parser.parse_args()
+
+    level = args.level
+    if level is None:
+        try:
+            level = int(input(f"Вкажіть рівень рекурсії (1–{MAX_LEVEL}): ").strip())
+        except Exception:
+            level = 8
+    level = max(1, min(level, MAX_LEVEL))
+    stats = {}
+    levels = branch_levels(TRUNK_LENGTH, level, angle_deg=args.angle, scale=args.scale,
+                           min_length=args.threshold, stats=stats)
+
+    if args.png is None and args.svg is None and args.mpl is None and level > TURTLE_MAX_LEVEL:
+        print(f"Рівень {level} завеликий для turtle — зберігаю pythagoras_tree.png")
+        args.png = "pythagoras_tree.png"
+    if args.png is not None:
+        render_png(levels, args.png)
+    elif args.svg is not None:
+        render_svg(levels, args.svg)
+    elif args.mpl is not None:
+        render_matplotlib(levels, args.mpl or None)
+    else:
+        screen = turtle.Screen()
+        screen.title("Фрактал: Дерево Піфагора")
+        screen.bgcolor("white")
+        screen.setup(width=900, height=900)
+        screen.colormode(255)
+
+        t = turtle.Turtle(visible=False)
+        t.pensize(2)
+        t.speed(0)
+        turtle.tracer(0, 0)
+
+        render_turtle(t, levels)
+
+        turtle.update()
+        print(f"Відрізків: {stats['emitted']:,}, відкинуто дрібніших за поріг: {stats['culled']:,}")
+        screen.mainloop()
+        return
+    print(f"Відрізків: {stats['emitted']:,}, відкинуто дрібніших за поріг: {stats['culled']:,}")
 
 if __name__ == "__main__":
     main()
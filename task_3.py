@@ -1,9 +1,169 @@
+import csv
 import heapq
-from typing import Dict, List, Tuple, Optional
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import hypot
+from typing import Callable, Dict, List, Tuple, Optional
+
+import numpy as np
+
+INF = float('inf')
+
+# Скільки ребер читаємо й перевіряємо за раз під час потокового завантаження
+LOAD_CHUNK_EDGES = 1_000_000
+
+# Бінарний формат ребер: MAGIC, далі записи (u: int64, v: int64, w: float64); імена вершин — str(id)
+BINARY_EDGES_MAGIC = b"EDGES001"
+BINARY_EDGE_DTYPE = np.dtype([("u", "<i8"), ("v", "<i8"), ("w", "<f8")])
+
+
+# --- Черги з пріоритетом для Dijkstra ---
+class LazyHeapQueue:
+    """heapq з лінивим видаленням: повторний push лишає в купі застарілий запис."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, str]] = []
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: str, key: float) -> None:
+        heapq.heappush(self._heap, (key, item))
+        self.pushes += 1
+        self.peak = max(self.peak, len(self._heap))
+
+    def pop(self) -> Tuple[float, str]:
+        self.pops += 1
+        return heapq.heappop(self._heap)
+
+
+class IndexedHeapQueue:
+    """
+    Індексована бінарна купа зі справжнім decrease-key: кожна вершина присутня
+    щонайбільше один раз, тож розмір купи не перевищує кількості вершин.
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[float] = []
+        self._items: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, item: str, key: float) -> None:
+        """Вставка або зменшення ключа, якщо item уже в купі."""
+        self.pushes += 1
+        i = self._pos.get(item)
+        if i is None:
+            i = len(self._items)
+            self._keys.append(key)
+            self._items.append(item)
+            self._pos[item] = i
+            self.peak = max(self.peak, len(self._items))
+        elif key < self._keys[i]:
+            self._keys[i] = key
+        else:
+            return
+        self._sift_up(i)
+
+    def pop(self) -> Tuple[float, str]:
+        self.pops += 1
+        key, item = self._keys[0], self._items[0]
+        last_key, last_item = self._keys.pop(), self._items.pop()
+        del self._pos[item]
+        if self._items:
+            self._keys[0], self._items[0] = last_key, last_item
+            self._pos[last_item] = 0
+            self._sift_down(0)
+        return key, item
+
+    def _swap(self, i: int, j: int) -> None:
+        self._keys[i], self._keys[j] = self._keys[j], self._keys[i]
+        self._items[i], self._items[j] = self._items[j], self._items[i]
+        self._pos[self._items[i]] = i
+        self._pos[self._items[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._keys[i] >= self._keys[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        n = len(self._items)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._keys[child] < self._keys[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+
+class RadixHeapQueue:
+    """
+    Монотонна radix-купа для цілих ваг: запис із ключем k лежить у кошику
+    (k XOR last).bit_length(), де last — останній вийнятий ключ. Коли кошик 0
+    порожній, найменший непорожній кошик перерозподіляється. Кошиків — O(log C).
+    """
+
+    def __init__(self) -> None:
+        self._buckets: List[List[Tuple[int, str]]] = [[]]
+        self._last = 0
+        self._size = 0
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, item: str, key: float) -> None:
+        if key != int(key):
+            raise ValueError("RadixHeapQueue працює лише з цілими вагами.")
+        key = int(key)
+        b = (key ^ self._last).bit_length()
+        while len(self._buckets) <= b:
+            self._buckets.append([])
+        self._buckets[b].append((key, item))
+        self._size += 1
+        self.pushes += 1
+        self.peak = max(self.peak, self._size)
+
+    def pop(self) -> Tuple[float, str]:
+        if not self._buckets[0]:
+            i = next(i for i, bucket in enumerate(self._buckets) if bucket)
+            bucket, self._buckets[i] = self._buckets[i], []
+            self._last = min(key for key, _ in bucket)
+            for key, item in bucket:
+                self._buckets[(key ^ self._last).bit_length()].append((key, item))
+        self._size -= 1
+        self.pops += 1
+        key, item = self._buckets[0].pop()
+        return float(key), item
+
+
+QUEUES = {"heapq": LazyHeapQueue, "indexed": IndexedHeapQueue, "radix": RadixHeapQueue}
+
 
 class Graph:
     def __init__(self):
         self.adj: Dict[str, List[Tuple[str, float]]] = {}
+        # обернені списки суміжності для двонапрямного пошуку (будуються ліниво)
+        self._radj: Optional[Dict[str, List[Tuple[str, float]]]] = None
+        # лічильник змін графа (для перевірки актуальності кешованих дерев)
+        self.version = 0
 
     def add_edge(self, u: str, v: str, w: float, undirected: bool = True) -> None:
         if w < 0:
@@ -13,10 +173,54 @@ class Graph:
         self.adj.setdefault(v, [])
         if undirected:
             self.adj[v].append((u, w))
+        self._radj = None
+        self.version += 1
 
-    def dijkstra(self, start: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+    @classmethod
+    def from_edge_list(cls, path: str, undirected: bool = True, delimiter: Optional[str] = None,
+                       use_cache: bool = True) -> "Graph":
+        """
+        Масове завантаження графа з файлу ребер (див. FrozenGraph.from_edge_list) без
+        виклику add_edge для кожного ребра: списки суміжності будуються з CSR-масивів.
+        """
+        frozen = FrozenGraph.from_edge_list(path, undirected, delimiter, use_cache)
+        g = cls()
+        names = frozen.names
+        targets, weights = frozen.targets.tolist(), frozen.weights.tolist()
+        offsets = frozen.offsets
+        for i, name in enumerate(names):
+            lo, hi = offsets[i], offsets[i + 1]
+            g.adj[name] = [(names[v], w) for v, w in zip(targets[lo:hi], weights[lo:hi])]
+        return g
+
+    def freeze(self) -> "FrozenGraph":
+        """
+        Повертає незмінну CSR-копію графа (масиви offsets/targets/weights + інтернування
+        імен у цілі id) для швидкого Dijkstra на великих графах.
+        """
+        names = sorted(self.adj)
+        index = {name: i for i, name in enumerate(names)}
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for name in names:
+            for v, w in self.adj[name]:
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        return FrozenGraph(names, offsets, targets, weights)
+
+    def dijkstra(self, start: str, queue: str = "heapq",
+                 stats: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """
+        queue ∈ {"heapq", "indexed", "radix"} — черга з пріоритетом (див. QUEUES);
+        "radix" лише для цілих ваг. Якщо передано stats, записує туди
+        "pushes", "pops", "peak" (макс. розмір черги) і "time" (секунди).
+        """
         if start not in self.adj:
             raise KeyError(f"Стартова вершина {start!r} відсутня у графі")
+        if queue != "heapq" or stats is not None:
+            return self._dijkstra_with_queue(start, queue, stats)
 
         dist: Dict[str, float] = {node: float('inf') for node in self.adj}
         parent: Dict[str, Optional[str]] = {node: None for node in self.adj}
@@ -38,6 +242,162 @@ class Graph:
 
         return dist, parent
 
+    def _dijkstra_with_queue(self, start: str, queue: str,
+                             stats: Optional[Dict[str, float]]) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        if queue not in QUEUES:
+            raise ValueError(f"Unknown queue. Use one of: {', '.join(QUEUES)}.")
+        t0 = time.perf_counter()
+        dist: Dict[str, float] = {node: float('inf') for node in self.adj}
+        parent: Dict[str, Optional[str]] = {node: None for node in self.adj}
+        dist[start] = 0.0
+
+        q = QUEUES[queue]()
+        q.push(start, 0.0)
+        while q:
+            d_u, u = q.pop()
+            if d_u > dist[u]:
+                continue
+
+            for v, w in self.adj[u]:
+                cand = d_u + w
+                if cand < dist[v]:
+                    dist[v] = cand
+                    parent[v] = u
+                    q.push(v, cand)
+
+        if stats is not None:
+            stats.update(pushes=q.pushes, pops=q.pops, peak=q.peak, time=time.perf_counter() - t0)
+        return dist, parent
+
+    def distance_matrix(self, sources: List[str], targets: List[str],
+                        workers: int = 1) -> np.ndarray:
+        """Матриця відстаней len(sources) × len(targets); див. FrozenGraph.distance_matrix."""
+        return self.freeze().distance_matrix(sources, targets, workers)
+
+    def _reverse_adj(self) -> Dict[str, List[Tuple[str, float]]]:
+        if self._radj is None:
+            radj: Dict[str, List[Tuple[str, float]]] = {node: [] for node in self.adj}
+            for u, edges in self.adj.items():
+                for v, w in edges:
+                    radj[v].append((u, w))
+            self._radj = radj
+        return self._radj
+
+    def shortest_path(self, source: str, target: str, method: str = "dijkstra",
+                      heuristic: Optional[Callable[[str, str], float]] = None,
+                      stats: Optional[Dict[str, int]] = None) -> Tuple[float, List[str]]:
+        """
+        Найкоротший шлях між двома вершинами без обходу всього графа:
+          method ∈ {"dijkstra", "bidirectional", "astar"}
+            "dijkstra"      — зупинка, щойно target остаточно встановлено
+            "bidirectional" — зустрічні пошуки від source і до target
+            "astar"         — A* з допустимою евристикою heuristic(node, target)
+        Якщо передано stats, записує туди "settled" — кількість встановлених вершин.
+        Повертає (відстань, шлях); для недосяжної вершини — (inf, []).
+        """
+        for node in (source, target):
+            if node not in self.adj:
+                raise KeyError(f"Вершина {node!r} відсутня у графі")
+
+        if method == "dijkstra":
+            dist, path, settled = self._astar(source, target, lambda node, goal: 0.0)
+        elif method == "astar":
+            if heuristic is None:
+                raise ValueError("Для A* потрібна евристика heuristic(node, target).")
+            dist, path, settled = self._astar(source, target, heuristic)
+        elif method == "bidirectional":
+            dist, path, settled = self._bidirectional(source, target)
+        else:
+            raise ValueError("Unknown method. Use 'dijkstra', 'bidirectional' or 'astar'.")
+
+        if stats is not None:
+            stats["settled"] = settled
+        return dist, path
+
+    def _astar(self, source: str, target: str,
+               heuristic: Callable[[str, str], float]) -> Tuple[float, List[str], int]:
+        """
+        A* (з нульовою евристикою — Dijkstra з ранньою зупинкою). Закритої множини немає:
+        застарілі записи черги пропускаються, а вершину, чия відстань зменшилась, відкриваємо
+        знову, тож результат точний для будь-якої допустимої (не обов'язково монотонної) евристики.
+        settled рахує розкриття вершин, зокрема повторні.
+        """
+        dist: Dict[str, float] = {source: 0.0}
+        parent: Dict[str, Optional[str]] = {source: None}
+        settled = 0
+        heap: List[Tuple[float, float, str]] = [(heuristic(source, target), 0.0, source)]
+
+        while heap:
+            _, d_u, u = heapq.heappop(heap)
+            if d_u > dist[u]:
+                continue
+            settled += 1
+            if u == target:
+                return d_u, self.reconstruct_path(parent, target), settled
+
+            for v, w in self.adj[u]:
+                cand = d_u + w
+                if cand < dist.get(v, INF):
+                    dist[v] = cand
+                    parent[v] = u
+                    heapq.heappush(heap, (cand + heuristic(v, target), cand, v))
+
+        return INF, [], settled
+
+    def _bidirectional(self, source: str, target: str) -> Tuple[float, List[str], int]:
+        """
+        Двонапрямний Dijkstra: по черзі розширюємо прямий (по adj) і зворотний
+        (по оберненому графу) пошуки; зупинка, коли сума вершин двох черг >= найкращого шляху.
+        """
+        if source == target:
+            return 0.0, [source], 1
+        adjs = (self.adj, self._reverse_adj())
+        dists: Tuple[Dict[str, float], Dict[str, float]] = ({source: 0.0}, {target: 0.0})
+        parents: Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]] = ({source: None}, {target: None})
+        done = (set(), set())
+        heaps: Tuple[List[Tuple[float, str]], List[Tuple[float, str]]] = ([(0.0, source)], [(0.0, target)])
+        best, meet = INF, None
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d_u, u = heapq.heappop(heaps[side])
+            if u in done[side]:
+                continue
+            done[side].add(u)
+
+            dist, other = dists[side], dists[1 - side]
+            for v, w in adjs[side][u]:
+                cand = d_u + w
+                if cand < dist.get(v, INF):
+                    dist[v] = cand
+                    parents[side][v] = u
+                    heapq.heappush(heaps[side], (cand, v))
+                if v in other and cand + other[v] < best:
+                    best, meet = cand + other[v], v
+
+        settled = len(done[0]) + len(done[1])
+        if meet is None:
+            return INF, [], settled
+        path = self.reconstruct_path(parents[0], meet)
+        cur = parents[1][meet]
+        while cur is not None:
+            path.append(cur)
+            cur = parents[1][cur]
+        return best, path, settled
+
+    @staticmethod
+    def euclidean_heuristic(coords: Dict[str, Tuple[float, float]]) -> Callable[[str, str], float]:
+        """
+        Евристика для A* за координатами вершин. Допустима, якщо вага кожного ребра
+        не менша за евклідову відстань між його кінцями.
+        """
+        def heuristic(node: str, target: str) -> float:
+            (x1, y1), (x2, y2) = coords[node], coords[target]
+            return hypot(x1 - x2, y1 - y2)
+        return heuristic
+
     @staticmethod
     def reconstruct_path(parent: Dict[str, Optional[str]], target: str) -> List[str]:
         """Повертає список вершин від старту до target (якщо шлях існує)."""
@@ -50,7 +410,822 @@ class Graph:
         return path
 
 
+class ShortestPathCache:
+    """
+    LRU-кеш дерев найкоротших шляхів (dist, parent) для «гарячих» стартових вершин.
+    Ребра слід додавати через cache.add_edge: нове ребро може лише зменшити відстані,
+    тож кешовані дерева ремонтуються інкрементно — Dijkstra стартує лише з вершин,
+    чия відстань покращилась. Якщо ремонт зачіпає більше repair_limit частки вершин
+    або граф змінено в обхід кешу, дерево відкидається й перераховується при наступному запиті.
+    Повернуті словники спільні з кешем — їх не слід змінювати.
+    """
+
+    def __init__(self, graph: Graph, memory_budget: int = 64 * 1024 * 1024,
+                 repair_limit: float = 0.25) -> None:
+        self.graph = graph
+        self.memory_budget = memory_budget
+        self.repair_limit = repair_limit
+        # start -> (dist, parent, версія графа, оцінка розміру в байтах)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, float], Dict[str, Optional[str]], int, int]]" = OrderedDict()
+        self._memory = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "repairs": 0,
+                                      "recomputes": 0, "evictions": 0}
+
+    @staticmethod
+    def _entry_size(dist: Dict[str, float], parent: Dict[str, Optional[str]]) -> int:
+        return sys.getsizeof(dist) + sys.getsizeof(parent) + 24 * len(dist)
+
+    def dijkstra(self, start: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Те саме, що graph.dijkstra(start), але з кешу, якщо дерево актуальне."""
+        entry = self._entries.get(start)
+        if entry is not None and entry[2] == self.graph.version:
+            self._entries.move_to_end(start)
+            self.stats["hits"] += 1
+            return entry[0], entry[1]
+        if entry is not None:
+            self._drop(start)
+            self.stats["recomputes"] += 1
+        else:
+            self.stats["misses"] += 1
+
+        dist, parent = self.graph.dijkstra(start)
+        size = self._entry_size(dist, parent)
+        self._entries[start] = (dist, parent, self.graph.version, size)
+        self._memory += size
+        self._evict()
+        return dist, parent
+
+    def _evict(self) -> None:
+        """Викидає найдавніше використані дерева, доки пам'ять не вкладеться в бюджет."""
+        while self._memory > self.memory_budget and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def add_edge(self, u: str, v: str, w: float, undirected: bool = True) -> None:
+        """Додає ребро в граф і ремонтує всі кешовані дерева."""
+        before = self.graph.version
+        self.graph.add_edge(u, v, w, undirected)
+        edges = [(u, v, w), (v, u, w)] if undirected else [(u, v, w)]
+        for start in list(self._entries):
+            dist, parent, version, size = self._entries[start]
+            if version != before or not self._repair(dist, parent, edges):
+                # граф змінювали в обхід кешу або ремонт завеликий — перерахуємо при запиті
+                self._entries[start] = (dist, parent, -1, size)
+                continue
+            new_size = self._entry_size(dist, parent)
+            self._memory += new_size - size
+            self._entries[start] = (dist, parent, self.graph.version, new_size)
+            self.stats["repairs"] += 1
+        # відремонтовані дерева могли вирости (нові вершини) — бюджет перевіряється і тут
+        self._evict()
+
+    def _repair(self, dist: Dict[str, float], parent: Dict[str, Optional[str]],
+                edges: List[Tuple[str, str, float]]) -> bool:
+        """
+        Динамічне оновлення SSSP після додавання ребер: повторно релаксуються лише
+        вершини, чия відстань зменшилась. Повертає False, якщо зачеплено забагато вершин;
+        тоді всі зміни відкочуються (журнал старих значень), тож dist/parent лишаються
+        цілим деревом для попередньої версії графа, а не напіввідремонтованим.
+        """
+        undo: Dict[str, Optional[Tuple[float, Optional[str]]]] = {}  # None — вершини не було
+
+        def assign(node: str, d: float, p: Optional[str]) -> None:
+            if node not in undo:
+                undo[node] = (dist[node], parent[node]) if node in dist else None
+            dist[node] = d
+            parent[node] = p
+
+        heap: List[Tuple[float, str]] = []
+        for a, b, w in edges:
+            for node in (a, b):
+                if node not in dist:
+                    assign(node, INF, None)
+            cand = dist[a] + w
+            if cand < dist[b]:
+                assign(b, cand, a)
+                heapq.heappush(heap, (cand, b))
+
+        limit = self.repair_limit * len(dist)
+        touched = 0
+        while heap:
+            d_u, u = heapq.heappop(heap)
+            if d_u > dist[u]:
+                continue
+            touched += 1
+            if touched > limit:
+                for node, old in undo.items():
+                    if old is None:
+                        del dist[node], parent[node]
+                    else:
+                        dist[node], parent[node] = old
+                return False
+            for v, w in self.graph.adj[u]:
+                cand = d_u + w
+                if cand < dist[v]:
+                    assign(v, cand, u)
+                    heapq.heappush(heap, (cand, v))
+        return True
+
+    def _drop(self, start: str) -> None:
+        self._memory -= self._entries.pop(start)[3]
+
+
+class FrozenGraph:
+    """
+    Компактне незмінне подання графа у форматі CSR: сусіди вершини i — це
+    targets[offsets[i]:offsets[i+1]] з вагами weights[...]. Імена вершин інтерновані
+    в цілі id (names[i] — ім'я, index[name] — id; id упорядковані за іменами, тож
+    за рівних відстаней результати збігаються з Graph.dijkstra).
+    """
+
+    def __init__(self, names: List[str], offsets: array, targets: array, weights: array) -> None:
+        self.names = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_arrays(cls, names: List[str], offsets: np.ndarray, targets: np.ndarray,
+                    weights: np.ndarray) -> "FrozenGraph":
+        """Створює FrozenGraph з NumPy-масивів CSR (копіюючи їх у компактні array)."""
+        return cls(names,
+                   array('q', np.ascontiguousarray(offsets, dtype=np.int64).tobytes()),
+                   array('q', np.ascontiguousarray(targets, dtype=np.int64).tobytes()),
+                   array('d', np.ascontiguousarray(weights, dtype=np.float64).tobytes()))
+
+    @classmethod
+    def from_edge_list(cls, path: str, undirected: bool = True, delimiter: Optional[str] = None,
+                       use_cache: bool = True) -> "FrozenGraph":
+        """
+        Потокове завантаження файлу ребер у CSR без проміжного Graph.
+          Формати: CSV/TSV рядки "u,v,w" (роздільник — за розширенням або delimiter;
+          рядки з '#' і заголовок пропускаються) або бінарний (BINARY_EDGES_MAGIC).
+          Ваги перевіряються блоками по LOAD_CHUNK_EDGES.
+        Результат збігається з побудовою через add_edge(..., undirected) + freeze().
+        Якщо use_cache, поруч зберігається <path>.csr.npz; повторне завантаження
+        незміненого файлу читає готові масиви.
+        """
+        cache_path = path + ".csr.npz"
+        st = os.stat(path)
+        key = np.array([st.st_size, st.st_mtime_ns, int(undirected)], dtype=np.int64)
+        if use_cache and os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                if np.array_equal(data["key"], key):
+                    return cls.from_arrays(data["names"].tolist(), data["offsets"],
+                                           data["targets"], data["weights"])
+
+        sources, dests, weights = _read_edge_arrays(path, delimiter)
+        names_arr, ids = _intern_names(np.concatenate([sources, dests]))
+        m = len(sources)
+        u, v = ids[:m], ids[m:]
+        if undirected:
+            # дуги у порядку, в якому їх додав би add_edge: (u, v), потім (v, u)
+            arc_src = np.column_stack([u, v]).ravel()
+            arc_dst = np.column_stack([v, u]).ravel()
+            arc_w = np.repeat(weights, 2)
+        else:
+            arc_src, arc_dst, arc_w = u, v, weights
+        order = np.argsort(arc_src, kind="stable")
+        offsets = np.zeros(len(names_arr) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arc_src, minlength=len(names_arr)), out=offsets[1:])
+        targets, arc_weights = arc_dst[order], arc_w[order]
+
+        if use_cache:
+            with open(cache_path, "wb") as f:
+                np.savez(f, key=key, names=names_arr, offsets=offsets, targets=targets, weights=arc_weights)
+        return cls.from_arrays(names_arr.tolist(), offsets, targets, arc_weights)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def as_numpy(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Представлення (offsets, targets, weights) як NumPy-масивів без копіювання."""
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.targets, dtype=np.int64),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+    def node_id(self, name: str) -> int:
+        if name not in self.index:
+            raise KeyError(f"Вершина {name!r} відсутня у графі")
+        return self.index[name]
+
+    def dijkstra_ids(self, source: int) -> Tuple[array, array]:
+        """
+        Dijkstra над цілими id: dist і parent — масиви array('d')/array('q'),
+        parent[v] == -1 для старту та недосяжних вершин.
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        dist = array('d', [INF]) * self.num_nodes
+        parent = array('q', [-1]) * self.num_nodes
+        dist[source] = 0.0
+
+        heap: List[Tuple[float, int]] = [(0.0, source)]
+        while heap:
+            d_u, u = heapq.heappop(heap)
+            if d_u > dist[u]:
+                continue
+
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                cand = d_u + weights[e]
+                if cand < dist[v]:
+                    dist[v] = cand
+                    parent[v] = u
+                    heapq.heappush(heap, (cand, v))
+
+        return dist, parent
+
+    def distances_to(self, source: int, targets: List[int]) -> List[float]:
+        """
+        Відстані від source до кожної з targets (цілі id). Пошук зупиняється,
+        щойно встановлено всі цілі, а не весь досяжний граф.
+        """
+        offsets, edge_targets, weights = self.offsets, self.targets, self.weights
+        dist: Dict[int, float] = {source: 0.0}
+        done = set()
+        remaining = set(targets)
+        heap: List[Tuple[float, int]] = [(0.0, source)]
+        while heap and remaining:
+            d_u, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            remaining.discard(u)
+
+            for e in range(offsets[u], offsets[u + 1]):
+                v = edge_targets[e]
+                cand = d_u + weights[e]
+                if cand < dist.get(v, INF):
+                    dist[v] = cand
+                    heapq.heappush(heap, (cand, v))
+        return [dist.get(t, INF) for t in targets]
+
+    def distance_matrix(self, sources: List[str], targets: List[str],
+                        workers: int = 1) -> np.ndarray:
+        """
+        Матриця відстаней len(sources) × len(targets) (inf — недосяжно).
+        При workers > 1 стартові вершини розподіляються блоками між процесами;
+        граф передається кожному процесу один раз (через initializer), а не з кожним
+        завданням, і рядки записуються в матрицю в міру надходження блоків.
+        """
+        if workers < 1:
+            raise ValueError("workers має бути >= 1")
+        source_ids = [self.node_id(name) for name in sources]
+        target_ids = [self.node_id(name) for name in targets]
+        matrix = np.full((len(source_ids), len(target_ids)), INF)
+
+        if workers == 1:
+            for row, s in enumerate(source_ids):
+                matrix[row] = self.distances_to(s, target_ids)
+            return matrix
+
+        chunk = max(1, len(source_ids) // (workers * 4))
+        blocks = [(start, source_ids[start:start + chunk], target_ids)
+                  for start in range(0, len(source_ids), chunk)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_matrix_worker,
+                                 initargs=(self,)) as pool:
+            for start, rows in pool.map(_matrix_block, blocks):
+                matrix[start:start + len(rows)] = rows
+        return matrix
+
+    def dijkstra(self, start: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Те саме, що Graph.dijkstra: словники відстаней і батьків за іменами вершин."""
+        if start not in self.index:
+            raise KeyError(f"Стартова вершина {start!r} відсутня у графі")
+        dist_ids, parent_ids = self.dijkstra_ids(self.index[start])
+        names = self.names
+        dist = dict(zip(names, dist_ids))
+        parent = {name: (names[p] if p >= 0 else None) for name, p in zip(names, parent_ids)}
+        return dist, parent
+
+
+def write_binary_edges(path: str, sources, targets, weights) -> None:
+    """Записує ребра з цілими id вершин у бінарний формат для FrozenGraph.from_edge_list."""
+    records = np.empty(len(sources), dtype=BINARY_EDGE_DTYPE)
+    records["u"], records["v"], records["w"] = sources, targets, weights
+    with open(path, "wb") as f:
+        f.write(BINARY_EDGES_MAGIC)
+        records.tofile(f)
+
+
+def _check_weights(weights: np.ndarray) -> None:
+    if (weights < 0).any():
+        raise ValueError("Алгоритм Дейкстри не працює з від’ємними вагами.")
+    if np.isnan(weights).any():
+        raise ValueError("Вага ребра не може бути NaN.")
+
+
+def _read_edge_arrays(path: str, delimiter: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Читає файл ребер блоками; повертає масиви (джерела, призначення, ваги).
+    Для CSV/TSV вершини — рядки, для бінарного формату — цілі id (int64).
+    """
+    with open(path, "rb") as f:
+        is_binary = f.read(len(BINARY_EDGES_MAGIC)) == BINARY_EDGES_MAGIC
+    if is_binary:
+        records = np.memmap(path, dtype=BINARY_EDGE_DTYPE, mode="r", offset=len(BINARY_EDGES_MAGIC))
+        for start in range(0, len(records), LOAD_CHUNK_EDGES):
+            _check_weights(records["w"][start:start + LOAD_CHUNK_EDGES])
+        # id лишаються цілими: імена з них робляться вже після np.unique (див. _intern_names)
+        return records["u"], records["v"], np.array(records["w"], dtype=np.float64)
+
+    if delimiter is None:
+        delimiter = "\t" if path.endswith((".tsv", ".tab")) else ","
+    src_parts: List[np.ndarray] = []
+    dst_parts: List[np.ndarray] = []
+    w_parts: List[np.ndarray] = []
+    src: List[str] = []
+    dst: List[str] = []
+    ws: List[str] = []
+
+    def flush() -> None:
+        w = np.array(ws, dtype=np.float64)
+        _check_weights(w)
+        src_parts.append(np.array(src, dtype=str))
+        dst_parts.append(np.array(dst, dtype=str))
+        w_parts.append(w)
+        src.clear(); dst.clear(); ws.clear()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for lineno, row in enumerate(csv.reader(f, delimiter=delimiter)):
+            if not row or row[0].startswith("#"):
+                continue
+            if len(row) < 3:
+                raise ValueError(f"{path}:{lineno + 1}: очікується 'u{delimiter}v{delimiter}w'")
+            if not src and not src_parts:
+                try:
+                    float(row[2])
+                except ValueError:
+                    continue  # рядок заголовка
+            src.append(row[0].strip())
+            dst.append(row[1].strip())
+            ws.append(row[2])
+            if len(ws) >= LOAD_CHUNK_EDGES:
+                flush()
+    if ws or not w_parts:
+        flush()
+    return np.concatenate(src_parts), np.concatenate(dst_parts), np.concatenate(w_parts)
+
+
+def _intern_names(endpoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Унікальні імена вершин (відсортовані як рядки, як у freeze()) і id кожного кінця ребра.
+    Цілі id спершу унікалізуються як int64 — у рядки перетворюються лише унікальні
+    вершини, після чого їхній порядок переставляється у рядковий.
+    """
+    if endpoints.dtype.kind not in "iu":
+        return np.unique(endpoints, return_inverse=True)
+    unique_ids, inverse = np.unique(endpoints, return_inverse=True)
+    names = unique_ids.astype(str)
+    order = np.argsort(names, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return names[order], rank[inverse]
+
+
+# Граф, переданий процесу пулу один раз при старті (див. FrozenGraph.distance_matrix)
+_WORKER_GRAPH: Optional[FrozenGraph] = None
+
+
+def _init_matrix_worker(graph: FrozenGraph) -> None:
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = graph
+
+
+def _matrix_block(block: Tuple[int, List[int], List[int]]) -> Tuple[int, List[List[float]]]:
+    start, source_ids, target_ids = block
+    return start, [_WORKER_GRAPH.distances_to(s, target_ids) for s in source_ids]
+
+
+class ContractionHierarchy:
+    """
+    Контракційна ієрархія (CH) для статичних графів. Попередня обробка по черзі
+    «стягує» вершини (порядок — за різницею ребер; після кожного стягування
+    пріоритети оновлюються лише для сусідів) і додає ребра-скорочення u -> w через
+    стягнуту v, якщо обмежений пошук свідків не знайшов шляху, не довшого за u -> v -> w.
+    Щільні вершини без ієрархії лишаються нестягнутим «ядром». Запит — двонапрямний
+    Dijkstra лише «вгору» за рангом (у ядрі — по всіх його ребрах); знайдений шлях
+    розгортається назад до вихідних імен вершин.
+    Індекс зберігається в компактний бінарний файл і може відкриватися через memmap.
+    """
+
+    MAGIC = b"CHIDX001"
+    _ARRAYS = (("rank", "<i8"),
+               ("up_offsets", "<i8"), ("up_targets", "<i8"), ("up_weights", "<f8"), ("up_mid", "<i8"),
+               ("down_offsets", "<i8"), ("down_sources", "<i8"), ("down_weights", "<f8"), ("down_mid", "<i8"))
+
+    def __init__(self, names: List[str], core_start: Optional[int] = None, **arrays) -> None:
+        self.names = names
+        # вершини з рангом >= core_start — нестягнуте ядро (за замовчуванням ядра немає)
+        self.core_start = len(names) if core_start is None else core_start
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        for name, _ in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        # списки сусідів (вгору, вниз), що їх запити вже торкалися: з memmap читаються лише вони
+        self._adj: Tuple[Dict[int, list], Dict[int, list]] = ({}, {})
+
+    # --- Попередня обробка ---
+    @classmethod
+    def build(cls, graph: "Graph", witness_limit: int = 64, hop_limit: int = 5,
+              core_degree: int = 24, stats: Optional[Dict[str, float]] = None) -> "ContractionHierarchy":
+        """
+        Будує ієрархію з Graph. Пошук свідків обмежений witness_limit встановленими
+        вершинами і hop_limit ребрами (більше — менше зайвих скорочень, але довша обробка).
+        Пріоритет вершини (різниця ребер + стягнуті сусіди + рівень) перераховується
+        лише для сусідів щойно стягнутої вершини; застарілі записи черги пропускаються.
+        Щойно найдешевша вершина має понад core_degree ребер (граф без ієрархії,
+        як випадкові графи), стягування зупиняється: решта вершин — «ядро», у якому
+        запит іде звичайним двонапрямним Dijkstra. Менший core_degree — швидша обробка
+        графів без ієрархії, більший — швидші запити на «дорожніх» графах (ґратках).
+        Якщо передано stats, туди пишуться "shortcuts", "core" і "time".
+        """
+        t0 = time.perf_counter()
+        frozen = graph.freeze()
+        n = frozen.num_nodes
+        # out[u][v] / inc[v][u] = (вага, стягнута вершина скорочення або -1)
+        out: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        inc: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(frozen.offsets[u], frozen.offsets[u + 1]):
+                v, w = frozen.targets[e], frozen.weights[e]
+                if v != u and w < out[u].get(v, (INF, -1))[0]:
+                    out[u][v] = inc[v][u] = (w, -1)
+
+        deleted_neighbors = [0] * n
+        level = [0] * n
+        # для оцінки пріоритету досить грубішого пошуку свідків; точний — лише при стягуванні
+        estimate_limit = max(1, witness_limit // 4)
+
+        def witness_dists(source: int, skip: int, limit: float, max_settled: int,
+                          targets: Dict[int, Tuple[float, int]]) -> Dict[int, float]:
+            # стягнуті вершини вже видалені з out/inc, тож перевіряти їх не треба;
+            # пошук зупиняється, щойно встановлено всі цілі targets
+            dist = {source: 0.0}
+            heap = [(0.0, 0, source)]
+            settled = 0
+            remaining = len(targets) - (source in targets)
+            while heap and remaining > 0:
+                d_u, hops, u = heapq.heappop(heap)
+                if d_u > dist[u]:
+                    continue
+                settled += 1
+                if d_u > limit or settled > max_settled:
+                    break
+                if u in targets and u != source:
+                    remaining -= 1
+                if hops >= hop_limit:
+                    continue
+                for x, (w, _) in out[u].items():
+                    if x == skip:
+                        continue
+                    cand = d_u + w
+                    if cand < dist.get(x, INF):
+                        dist[x] = cand
+                        heapq.heappush(heap, (cand, hops + 1, x))
+            return dist
+
+        def evaluate(v: int, max_settled: int) -> Tuple[int, List[Tuple[int, int, float]]]:
+            ins, outs = inc[v], out[v]
+            shortcuts: List[Tuple[int, int, float]] = []
+            if ins and outs:
+                max_out = max(w for w, _ in outs.values())
+                for u, (w_in, _) in ins.items():
+                    dist = witness_dists(u, v, w_in + max_out, max_settled, outs)
+                    for x, (w_out, _) in outs.items():
+                        if x != u and dist.get(x, INF) > w_in + w_out:
+                            shortcuts.append((u, x, w_in + w_out))
+            edge_diff = len(shortcuts) - len(ins) - len(outs)
+            return 2 * edge_diff + deleted_neighbors[v] + level[v], shortcuts
+
+        rank = array('q', [0]) * n
+        priority = [evaluate(v, estimate_limit)[0] for v in range(n)]
+        queue = [(p, v) for v, p in enumerate(priority)]
+        heapq.heapify(queue)
+        contracted = bytearray(n)
+        order = 0
+        num_shortcuts = 0
+        while queue:
+            p, v = heapq.heappop(queue)
+            if contracted[v] or p != priority[v]:
+                continue  # застарілий запис
+            if len(inc[v]) + len(out[v]) > core_degree:
+                break
+            _, shortcuts = evaluate(v, witness_limit)
+            for u, x, w in shortcuts:
+                if w < out[u].get(x, (INF, -1))[0]:
+                    out[u][x] = inc[x][u] = (w, v)
+                    num_shortcuts += 1
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+            # ребра стягнутої вершини прибираються з живого графа (але лишаються в out[v]/inc[v]
+            # для збирання ієрархії нижче)
+            neighbors = set(inc[v]) | set(out[v])
+            for u in inc[v]:
+                out[u].pop(v, None)
+            for x in out[v]:
+                inc[x].pop(v, None)
+            for nb in neighbors:
+                deleted_neighbors[nb] += 1
+                level[nb] = max(level[nb], level[v] + 1)
+                priority[nb] = evaluate(nb, estimate_limit)[0]
+                heapq.heappush(queue, (priority[nb], nb))
+
+        core = [v for v in range(n) if not contracted[v]]
+        for v in core:
+            rank[v] = order
+            order += 1
+
+        arrays = {name: array('q' if dtype == "<i8" else 'd') for name, dtype in cls._ARRAYS}
+        arrays["rank"] = rank
+        arrays["up_offsets"].append(0)
+        arrays["down_offsets"].append(0)
+        # ребра між вершинами ядра потрапляють і в up, і в down незалежно від рангу
+        for u in range(n):
+            for x, (w, mid) in out[u].items():
+                if rank[x] > rank[u] or not contracted[x]:
+                    arrays["up_targets"].append(x)
+                    arrays["up_weights"].append(w)
+                    arrays["up_mid"].append(mid)
+            arrays["up_offsets"].append(len(arrays["up_targets"]))
+            for x, (w, mid) in inc[u].items():
+                if rank[x] > rank[u] or not contracted[x]:
+                    arrays["down_sources"].append(x)
+                    arrays["down_weights"].append(w)
+                    arrays["down_mid"].append(mid)
+            arrays["down_offsets"].append(len(arrays["down_sources"]))
+        if stats is not None:
+            stats["shortcuts"] = num_shortcuts
+            stats["core"] = len(core)
+            stats["time"] = time.perf_counter() - t0
+        return cls(frozen.names, core_start=n - len(core), **arrays)
+
+    @property
+    def num_shortcuts(self) -> int:
+        return sum(1 for m in self.up_mid if m >= 0) + sum(1 for m in self.down_mid if m >= 0)
+
+    # --- Запити ---
+    def _node(self, name: str) -> int:
+        if name not in self.index:
+            raise KeyError(f"Вершина {name!r} відсутня у графі")
+        return self.index[name]
+
+    def _search(self, s: int, t: int):
+        """
+        Запит у дві фази. Спершу двонапрямний пошук угору зі stall-on-demand: вершина
+        не розкривається, якщо до неї є коротший шлях згори (тоді її мітка свідомо не
+        найкоротша); вершини ядра лише отримують мітки. Далі, якщо обидва пошуки дійшли
+        до ядра, — звичайний двонапрямний Dijkstra по ребрах ядра, стартуючи з цих міток.
+        Повертає (відстань, вершина зустрічі, батьки вперед/назад).
+        """
+        rank, core_start = self.rank, self.core_start
+        dists: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+        parents: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, s)], [(0.0, t)])
+        core_labels: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([], [])
+        best, meet = INF, -1
+
+        while True:
+            fwd, bwd = heaps
+            fwd_open = bool(fwd) and fwd[0][0] < best
+            bwd_open = bool(bwd) and bwd[0][0] < best
+            if not (fwd_open or bwd_open):
+                break
+            side = 0 if fwd_open and (not bwd_open or fwd[0][0] <= bwd[0][0]) else 1
+            d_u, u = heapq.heappop(heaps[side])
+            dist = dists[side]
+            if d_u > dist[u]:
+                continue
+            if rank[u] >= core_start:
+                core_labels[side].append((d_u, u))
+                continue
+            through = d_u + dists[1 - side].get(u, INF)
+            if through < best:
+                best, meet = through, u
+            # stall-on-demand: ребра «згори» в u — це ребра протилежного напрямку
+            for x, w in self._neighbors(1 - side, u):
+                if dist.get(x, INF) + w < d_u:
+                    break
+            else:
+                heap, parent = heaps[side], parents[side]
+                for v, w in self._neighbors(side, u):
+                    cand = d_u + w
+                    if cand < dist.get(v, INF):
+                        dist[v] = cand
+                        parent[v] = u
+                        heapq.heappush(heap, (cand, v))
+
+        if not (core_labels[0] and core_labels[1]):
+            return best, meet, parents
+        # фаза ядра: мітки першої фази — це стартові відстані (як від уявних джерела/стоку)
+        heaps = core_labels
+        for side in (0, 1):
+            heapq.heapify(heaps[side])
+            other = dists[1 - side]
+            for d_u, u in heaps[side]:
+                if d_u + other.get(u, INF) < best:
+                    best, meet = d_u + other.get(u, INF), u
+        while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d_u, u = heapq.heappop(heaps[side])
+            dist, other = dists[side], dists[1 - side]
+            if d_u > dist[u]:
+                continue
+            heap, parent = heaps[side], parents[side]
+            for v, w in self._neighbors(side, u):
+                cand = d_u + w
+                if cand < dist.get(v, INF):
+                    dist[v] = cand
+                    parent[v] = u
+                    heapq.heappush(heap, (cand, v))
+                    if cand + other.get(v, INF) < best:
+                        best, meet = cand + other.get(v, INF), v
+        return best, meet, parents
+
+    def _neighbors(self, side: int, u: int) -> List[Tuple[int, float]]:
+        """Ребра вершини u вгору (side=0) або вниз (side=1) як [(сусід, вага)], з кешем."""
+        cached = self._adj[side].get(u)
+        if cached is None:
+            if side == 0:
+                offsets, heads, weights = self.up_offsets, self.up_targets, self.up_weights
+            else:
+                offsets, heads, weights = self.down_offsets, self.down_sources, self.down_weights
+            lo, hi = int(offsets[u]), int(offsets[u + 1])
+            cached = self._adj[side][u] = list(zip(heads[lo:hi].tolist(), weights[lo:hi].tolist()))
+        return cached
+
+    def _edge_mid(self, a: int, b: int) -> int:
+        """Стягнута вершина ребра a -> b ієрархії (-1 — вихідне ребро)."""
+        if self.rank[b] > self.rank[a]:
+            lo, hi, heads, mids = self.up_offsets[a], self.up_offsets[a + 1], self.up_targets, self.up_mid
+            other = b
+        else:
+            lo, hi, heads, mids = self.down_offsets[b], self.down_offsets[b + 1], self.down_sources, self.down_mid
+            other = a
+        for e in range(lo, hi):
+            if heads[e] == other:
+                return int(mids[e])
+        raise KeyError(f"Ребро {a} -> {b} відсутнє в ієрархії")
+
+    def distance(self, source: str, target: str) -> float:
+        """Відстань source -> target (inf, якщо недосяжно)."""
+        return self._search(self._node(source), self._node(target))[0]
+
+    def shortest_path(self, source: str, target: str) -> Tuple[float, List[str]]:
+        """Повертає (відстань, шлях з вихідних імен вершин), як Graph.shortest_path."""
+        s, t = self._node(source), self._node(target)
+        best, meet, (pf, pb) = self._search(s, t)
+        if meet < 0:
+            return INF, []
+
+        hops: List[int] = []
+        cur = meet
+        while cur != -1:
+            hops.append(cur)
+            cur = pf[cur]
+        hops.reverse()
+        cur = pb[meet]
+        while cur != -1:
+            hops.append(cur)
+            cur = pb[cur]
+
+        path = [hops[0]]
+        stack = [(a, b, self._edge_mid(a, b)) for a, b in zip(reversed(hops[:-1]), reversed(hops[1:]))]
+        while stack:
+            a, b, mid = stack.pop()
+            if mid < 0:
+                path.append(b)
+            else:
+                stack.append((mid, b, self._edge_mid(mid, b)))
+                stack.append((a, mid, self._edge_mid(a, mid)))
+        return best, [self.names[i] for i in path]
+
+    # --- Збереження ---
+    def save(self, path: str) -> None:
+        """
+        Формат: MAGIC, довжина заголовка (8 байт), JSON-заголовок з іменами вершин
+        і зсувами масивів, далі сирі little-endian масиви, вирівняні на 8 байт.
+        """
+        blobs = [np.asarray(getattr(self, name), dtype=dtype) for name, dtype in self._ARRAYS]
+        layout: Dict[str, List[int]] = {}
+        header = b""
+        # зсуви залежать від довжини заголовка, тому рахуємо до стабілізації
+        for _ in range(3):
+            offset = len(self.MAGIC) + 8 + len(header)
+            offset += -offset % 8
+            for (name, _), blob in zip(self._ARRAYS, blobs):
+                layout[name] = [offset, len(blob)]
+                offset += blob.nbytes
+            header = json.dumps({"names": self.names, "core_start": self.core_start,
+                                 "arrays": layout}).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for (name, _), blob in zip(self._ARRAYS, blobs):
+                f.write(b"\0" * (layout[name][0] - f.tell()))
+                f.write(blob.tobytes())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ContractionHierarchy":
+        """Відкриває індекс, збережений save(); mmap=True — масиви відображаються з файлу без читання."""
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path!r} не є файлом індексу CH")
+            header = json.loads(f.read(int.from_bytes(f.read(8), "little")))
+        arrays = {}
+        for name, dtype in cls._ARRAYS:
+            offset, length = header["arrays"][name]
+            if mmap:
+                arrays[name] = (np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(length,))
+                                if length else np.zeros(0, dtype=dtype))
+            else:
+                arrays[name] = np.fromfile(path, dtype=dtype, count=length, offset=offset)
+        return cls(header["names"], core_start=header.get("core_start"), **arrays)
+
+
+def random_graph(n: int, avg_degree: int = 8, max_weight: int = 100, seed: int = 42) -> Graph:
+    """Випадковий неорієнтований граф із цілими вагами (для бенчмарків)."""
+    rng = random.Random(seed)
+    g = Graph()
+    for i in range(n):
+        g.add_edge(f"v{i}", f"v{(i + 1) % n}", rng.randint(1, max_weight))
+    for _ in range(n * avg_degree // 2):
+        g.add_edge(f"v{rng.randrange(n)}", f"v{rng.randrange(n)}", rng.randint(1, max_weight))
+    return g
+
+
+def grid_graph(rows: int, cols: int, max_weight: int = 10, seed: int = 42) -> Graph:
+    """Ґратка rows × cols з випадковими цілими вагами — «дорожній» граф для бенчмарку CH."""
+    rng = random.Random(seed)
+    g = Graph()
+    for i in range(rows):
+        for j in range(cols):
+            if j + 1 < cols:
+                g.add_edge(f"{i},{j}", f"{i},{j + 1}", rng.randint(1, max_weight))
+            if i + 1 < rows:
+                g.add_edge(f"{i},{j}", f"{i + 1},{j}", rng.randint(1, max_weight))
+    return g
+
+
+def benchmark_ch(queries: int = 300, seed: int = 42) -> None:
+    """
+    Побудова й запити ContractionHierarchy проти двонапрямного Dijkstra: ґратка 70×70
+    і випадковий граф на 5000 вершин (без ієрархії — там CH лише не гірший за Dijkstra).
+    """
+    cases = [("ґратка 70×70", grid_graph(70, 70, seed=seed), {}),
+             ("випадковий 5000", random_graph(5000, avg_degree=4, seed=seed), {}),
+             ("випадковий 5000", random_graph(5000, avg_degree=4, seed=seed), {"core_degree": 8})]
+    print(f"| {'граф':>15} | {'core_degree':>11} | {'побудова, с':>11} | {'скорочень':>9} | {'ядро':>5} | "
+          f"{'CH, мс':>7} | {'bidir, мс':>9} |")
+    print(f"|{'-' * 17}|{'-' * 13}|{'-' * 13}|{'-' * 11}|{'-' * 7}|{'-' * 9}|{'-' * 11}|")
+    rng = random.Random(seed)
+    for label, g, options in cases:
+        stats: Dict[str, float] = {}
+        ch = ContractionHierarchy.build(g, stats=stats, **options)
+        nodes = list(g.adj)
+        pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+        t0 = time.perf_counter()
+        ch_dists = [ch.distance(a, b) for a, b in pairs]
+        t_ch = (time.perf_counter() - t0) / queries * 1000
+        t0 = time.perf_counter()
+        ref_dists = [g.shortest_path(a, b, method="bidirectional")[0] for a, b in pairs]
+        t_bidir = (time.perf_counter() - t0) / queries * 1000
+        assert ch_dists == ref_dists, "CH дала інші відстані"
+        core_degree = options.get("core_degree", 24)
+        print(f"| {label:>15} | {core_degree:11d} | {stats['time']:11.2f} | {stats['shortcuts']:9d} | "
+              f"{stats['core']:5d} | {t_ch:7.3f} | {t_bidir:9.3f} |")
+
+
+def benchmark_queues(sizes=((10_000, 4), (10_000, 32), (50_000, 8)), seed: int = 42) -> None:
+    """Порівнює черги Dijkstra (pushes, pops, пік розміру, час) на згенерованих графах."""
+    print(f"| {'n':>6} | {'ступінь':>7} | {'черга':>7} | {'pushes':>8} | {'pops':>8} | {'пік':>7} | {'час, с':>7} |")
+    print(f"|{'-' * 8}|{'-' * 9}|{'-' * 9}|{'-' * 10}|{'-' * 10}|{'-' * 9}|{'-' * 9}|")
+    for n, degree in sizes:
+        g = random_graph(n, degree, seed=seed)
+        reference = None
+        for queue in QUEUES:
+            stats: Dict[str, float] = {}
+            dist, _ = g.dijkstra("v0", queue=queue, stats=stats)
+            if reference is None:
+                reference = dist
+            assert dist == reference, f"Черга {queue!r} дала інші відстані"
+            print(f"| {n:6d} | {degree:7d} | {queue:>7} | {stats['pushes']:8d} | {stats['pops']:8d} | "
+                  f"{stats['peak']:7d} | {stats['time']:7.3f} |")
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_queues()
+        benchmark_ch()
+        sys.exit(0)
+
     g = Graph()
     g.add_edge("A", "B", 4)
     g.add_edge("A", "C", 2)
@@ -74,3 +1249,19 @@ if __name__ == "__main__":
             print(f"  {start} -> {node}: недосяжно")
         else:
             print(f"  {start} -> {node}: {' -> '.join(path)} (вартість {dist[node]})")
+
+    print("\nТочкові запити A -> F:")
+    for method in ("dijkstra", "bidirectional"):
+        stats: Dict[str, int] = {}
+        d, path = g.shortest_path("A", "F", method=method, stats=stats)
+        print(f"  {method}: {' -> '.join(path)} (вартість {d}, встановлено вершин: {stats['settled']})")
+
+    # Регресія: допустима, але не монотонна евристика (h(A) = 11) — C відкривається повторно
+    h_graph = Graph()
+    for a, b, w in (("S", "A", 1), ("A", "C", 1), ("S", "B", 1), ("B", "C", 2), ("C", "G", 10)):
+        h_graph.add_edge(a, b, w, undirected=False)
+    h_values = {"A": 11.0}
+    d, path = h_graph.shortest_path("S", "G", method="astar",
+                                    heuristic=lambda node, goal: h_values.get(node, 0.0))
+    assert (d, path) == (12.0, ["S", "A", "C", "G"]), (d, path)
+    print(f"\nA* з немонотонною евристикою S -> G: {' -> '.join(path)} (вартість {d})")
@@ -1,8 +1,16 @@
-import uuid
+import itertools
 from typing import List, Optional
 
-import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from tree_layout import LABEL_LIMIT, draw_collections, edge_segments, heap_parents, heap_positions, tree_layout
+
+# Ширина смуги щільності (у бінах) для згорнутих нижніх рівнів
+DENSITY_BINS = 512
+
+_node_ids = itertools.count()
 
 
 class Node:
@@ -12,46 +20,22 @@ class Node:
         self.right: Optional["Node"] = None
         self.val = key
         self.color = color
-        self.id = str(uuid.uuid4())  # унікальний ідентифікатор для networkx
-
-
-def add_edges(graph: nx.DiGraph, node: Optional[Node], pos: dict, x=0.0, y=0.0, layer=1) -> nx.DiGraph:
-    """Рекурсивно додає вершини та ребра в граф, формуючи координати для гарної розкладки."""
-    if node is None:
-        return graph
-
-    graph.add_node(node.id, color=node.color, label=node.val)
-    if node.left:
-        graph.add_edge(node.id, node.left.id)
-        lx = x - 1 / 2 ** layer
-        pos[node.left.id] = (lx, y - 1)
-        add_edges(graph, node.left, pos, x=lx, y=y - 1, layer=layer + 1)
-
-    if node.right:
-        graph.add_edge(node.id, node.right.id)
-        rx = x + 1 / 2 ** layer
-        pos[node.right.id] = (rx, y - 1)
-        add_edges(graph, node.right, pos, x=rx, y=y - 1, layer=layer + 1)
-
-    return graph
+        self.id = next(_node_ids)  # унікальний цілий ідентифікатор
 
 
 def draw_tree(tree_root: Node, figsize=(8, 5), node_size=2500) -> None:
-    """Малює дерево з кореня tree_root за допомогою networkx."""
+    """Малює дерево з кореня tree_root: розкладка з tree_layout, колекції matplotlib."""
     if tree_root is None:
         print("Порожнє дерево — нічого малювати.")
         return
 
-    G = nx.DiGraph()
-    pos = {tree_root.id: (0, 0)}
-    add_edges(G, tree_root, pos)
-
-    colors = [data["color"] for _, data in G.nodes(data=True)]
-    labels = {n: data["label"] for n, data in G.nodes(data=True)}
+    layout = tree_layout(tree_root)
+    colors = [node.color for node in layout.nodes]
+    labels = [node.val for node in layout.nodes]
 
-    plt.figure(figsize=figsize)
-    nx.draw(G, pos=pos, labels=labels, arrows=False, node_size=node_size, node_color=colors)
-    plt.axis("off")
+    fig, ax = plt.subplots(figsize=figsize)
+    draw_collections(ax, layout.pos, layout.parent, colors, labels, node_size=node_size)
+    ax.margins(0.15)
     plt.show()
 
 
@@ -74,10 +58,114 @@ def heap_to_tree(heap: List[Optional[int]]) -> Optional[Node]:
     return build_node(0)
 
 
+# --- Малювання прямо з масиву ---
+def heap_mask(heap: List[Optional[int]]) -> np.ndarray:
+    """
+    Маска видимих позицій: значення не None і всі предки теж не None
+    (як у heap_to_tree, де «дірка» відрізає все своє піддерево). Рахується по рівнях векторно.
+    """
+    mask = np.fromiter((v is not None for v in heap), dtype=bool, count=len(heap))
+    start = 1
+    while start < len(heap):
+        stop = min(2 * start + 1, len(heap))
+        mask[start:stop] &= mask[(np.arange(start, stop) - 1) // 2]
+        start = stop
+    return mask
+
+
+def _node_levels(figsize, max_node_levels: Optional[int]) -> int:
+    """Скільки верхніх рівнів малювати окремими вузлами: ~8 пікселів на вузол найнижчого рівня."""
+    if max_node_levels is not None:
+        return max_node_levels
+    return max(1, int(np.log2(figsize[0] * 100 / 8)) + 1)
+
+
+class HeapView:
+    """
+    Візуалізація купи прямо з масиву, без Node-об'єктів: координати — закрита формула
+    heap_positions, «дірки» None — маска heap_mask. Верхні рівні малюються вузлами,
+    а глибші за max_node_levels згортаються в смуги щільності (по одній на рівень).
+    Підходить і для списків, які змінює heapq: після змін викличте refresh().
+    """
+
+    def __init__(self, heap: List[Optional[int]], ax: Optional[plt.Axes] = None, figsize=(8, 5),
+                 node_size: float = 2500, color: str = "skyblue",
+                 max_node_levels: Optional[int] = None) -> None:
+        self.heap = heap
+        if ax is None:
+            _, ax = plt.subplots(figsize=figsize)
+        self.ax = ax
+        self.node_size = node_size
+        self.color = color
+        self.node_levels = _node_levels(ax.figure.get_size_inches(), max_node_levels)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Перемальовує поточний стан масиву (наприклад, після heapq.heappush/heappop)."""
+        ax = self.ax
+        ax.clear()
+        n = len(self.heap)
+        if n == 0:
+            ax.set_axis_off()
+            return
+        mask = heap_mask(self.heap)
+        pos = heap_positions(n)
+        parent = heap_parents(n)
+
+        n_nodes = min(n, (1 << self.node_levels) - 1)
+        shown = np.flatnonzero(mask[:n_nodes])
+        # перенумерація батьків у межах показаних вузлів
+        remap = np.full(n_nodes, -1, dtype=np.int64)
+        remap[shown] = np.arange(len(shown))
+        shown_parent = np.where(parent[shown] >= 0, remap[np.maximum(parent[shown], 0)], -1)
+
+        deepest = int(np.log2(n_nodes)) if n_nodes else 0
+        width_pts = ax.figure.get_size_inches()[0] * 72
+        size = min(self.node_size, (0.6 * width_pts / 2 ** deepest) ** 2)
+        # підписи лише коли вони вміщаються у вузол
+        readable = len(shown) <= LABEL_LIMIT and size >= 400
+        labels = [self.heap[i] for i in shown.tolist()] if readable else None
+        draw_collections(ax, pos[shown], shown_parent, [self.color], labels, node_size=size)
+
+        if n > n_nodes:
+            self._draw_density(mask, pos, parent, n_nodes)
+        ax.margins(0.15)
+
+    def _draw_density(self, mask: np.ndarray, pos: np.ndarray, parent: np.ndarray, start: int) -> None:
+        """Рівні від start і нижче: гістограма x видимих вузлів як напівпрозора смуга."""
+        ax = self.ax
+        n = len(mask)
+        # ребра від останнього рівня вузлів до першого згорнутого
+        first = np.arange(start, min(2 * start + 1, n))
+        first = first[mask[first]]
+        ax.add_collection(LineCollection(edge_segments(pos, np.where(np.isin(np.arange(n), first), parent, -1)),
+                                         colors="black", linewidths=0.3, zorder=1))
+        depth = int(np.log2(start + 1))
+        while start < n:
+            stop = min(2 * start + 1, n)
+            xs = pos[start:stop, 0][mask[start:stop]]
+            hist, edges = np.histogram(xs, bins=DENSITY_BINS, range=(-1, 1))
+            level_width = stop - start
+            density = hist / max(1, (1 << depth) // DENSITY_BINS)
+            ax.imshow(np.clip(density, 0, 1)[None, :], extent=(-1, 1, -depth - 0.3, -depth + 0.3),
+                      cmap="Blues", vmin=0, vmax=1, aspect="auto", interpolation="nearest", zorder=0)
+            ax.text(1.02, -depth, f"{int(hist.sum())}/{level_width}", va="center", fontsize=7)
+            start, depth = stop, depth + 1
+
+
+def draw_heap(heap: List[Optional[int]], figsize=(8, 5), node_size=2500,
+              max_node_levels: Optional[int] = None) -> None:
+    """Малює купу прямо з масиву (див. HeapView) — без heap_to_tree і рекурсії."""
+    if not heap:
+        print("Порожня купа — нічого малювати.")
+        return
+    HeapView(heap, figsize=figsize, node_size=node_size, max_node_levels=max_node_levels)
+    plt.show()
+
+
 # ---------------- Демонстрація ----------------
 if __name__ == "__main__":
     # приклад мін-купи або просто будь-якої бінарної купи у вигляді масиву
     min_heap = [0, 4, 1, 5, 10, 3]  # 0 — корінь; діти 4 і 1; далі 5, 10, 3
 
-    root = heap_to_tree(min_heap)
-    draw_tree(root)
+    draw_heap(min_heap)
@@ -1,10 +1,20 @@
-import uuid
+import itertools
+import os
+import sys
+import time
+import tracemalloc
 from collections import deque
-from typing import Dict, Tuple, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, Tuple, List, Optional
 
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-import networkx as nx
+from matplotlib import animation
+
+from tree_layout import TreeLayout, draw_collections, tree_layout
+
+_node_ids = itertools.count()
 
 
 # --- Модель вузла ---
@@ -15,72 +25,186 @@ class Node:
         self.right: Optional["Node"] = None
         self.val: int = key
         self.color: str = color
-        self.id: str = str(uuid.uuid4())
-
-
-# --- Побудова графа та позицій ---
-def add_edges(graph: nx.DiGraph, node: Optional[Node], pos: Dict[str, Tuple[float, float]],
-    x: float = 0, y: float = 0, layer: int = 1) -> nx.DiGraph:
-    """
-    Рекурсивно додає вузли/ребра дерева у graph та обчислює позиції для красивого малювання.
-    (рекурсія лише для побудови графу, обхід буде без рекурсії)
-    """
-    if node is None:
-        return graph
+        self.id: int = next(_node_ids)
 
-    graph.add_node(node.id, color=node.color, label=node.val)
-    if node.left:
-        graph.add_edge(node.id, node.left.id)
-        lx = x - 1 / (2 ** layer)
-        pos[node.left.id] = (lx, y - 1)
-        add_edges(graph, node.left, pos, x=lx, y=y - 1, layer=layer + 1)
 
-    if node.right:
-        graph.add_edge(node.id, node.right.id)
-        rx = x + 1 / (2 ** layer)
-        pos[node.right.id] = (rx, y - 1)
-        add_edges(graph, node.right, pos, x=rx, y=y - 1, layer=layer + 1)
+# --- Побудова розкладки ---
+def build_layout(root: Node) -> TreeLayout:
+    """Розкладка дерева (вузли, координати, батьки) — без рекурсії."""
+    return tree_layout(root)
 
-    return graph
 
+def build_graph(root: Node):
+    """
+    Створює networkx-ґраф дерева та словник позицій вузлів (networkx — необов'язкова
+    залежність, потрібна лише цій функції).
+    """
+    import networkx as nx
 
-def build_graph(root: Node) -> Tuple[nx.DiGraph, Dict[str, Tuple[float, float]]]:
-    """Створює networkx-ґраф дерева та словник позицій вузлів."""
+    layout = build_layout(root)
     graph = nx.DiGraph()
-    pos = {root.id: (0.0, 0.0)}
-    add_edges(graph, root, pos)
+    for node in layout.nodes:
+        graph.add_node(node.id, color=node.color, label=node.val)
+    graph.add_edges_from((layout.nodes[p].id, layout.nodes[c].id)
+                         for c, p in enumerate(layout.parent.tolist()) if p >= 0)
+    pos = {node.id: (x, y) for node, (x, y) in zip(layout.nodes, layout.pos.tolist())}
     return graph, pos
 
 
 # --- Малювання ---
-def draw_tree(graph: nx.DiGraph, pos: Dict[str, Tuple[float, float]], ax: plt.Axes) -> None:
+def draw_layout(layout: TreeLayout, ax: plt.Axes) -> None:
     """Малює дерево у переданий Axes без блокування."""
     ax.clear()
-    colors = [data["color"] for _, data in graph.nodes(data=True)]
-    labels = {n: data["label"] for n, data in graph.nodes(data=True)}
-    nx.draw(graph, pos=pos, labels=labels, arrows=False,
-            node_size=2500, node_color=colors, font_size=10, ax=ax)
-    ax.set_axis_off()
+    colors = [node.color for node in layout.nodes]
+    labels = [node.val for node in layout.nodes]
+    draw_collections(ax, layout.pos, layout.parent, colors, labels)
+    ax.margins(0.15)
+
+
+def draw_tree(graph, pos: Dict[int, Tuple[float, float]], ax: plt.Axes) -> None:
+    """
+    Сумісна обгортка старого API: малює пару (graph, pos) з build_graph тими ж
+    колекціями, що й draw_layout (кольори й підписи — з атрибутів вузлів graph).
+    """
+    ax.clear()
+    ids = list(graph.nodes)
+    index = {node_id: j for j, node_id in enumerate(ids)}
+    parent = np.full(len(ids), -1, dtype=np.int64)
+    for p, c in graph.edges:
+        parent[index[c]] = index[p]
+    xy = np.array([pos[node_id] for node_id in ids], dtype=np.float64).reshape(-1, 2)
+    colors = [graph.nodes[node_id]["color"] for node_id in ids]
+    labels = [graph.nodes[node_id]["label"] for node_id in ids]
+    draw_collections(ax, xy, parent, colors, labels)
+    ax.margins(0.15)
 
 
 # --- Допоміжне: градієнт кольорів ---
-def generate_gradient_colors(n: int, base_color: str = "#1296F0") -> List[str]:
+# Розмір спільної таблиці кольорів (LUT), з якої інтерполюються палітри будь-якої довжини
+LUT_SIZE = 256
+
+# Біла точка D65 для переходу XYZ ↔ CIELAB
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                        [0.2126729, 0.7151522, 0.0721750],
+                        [0.0193339, 0.1191920, 0.9503041]])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+
+def _srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (…, 3) у [0, 1] → CIELAB (D65)."""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def _lab_to_srgb(lab: np.ndarray) -> np.ndarray:
+    """CIELAB (D65) → sRGB (…, 3), обрізаний до [0, 1]."""
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    xyz = np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29)) * _WHITE_D65
+    linear = np.clip(xyz @ _XYZ_TO_RGB.T, 0.0, 1.0)
+    rgb = np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return np.clip(rgb, 0.0, 1.0)
+
+
+def _gradient_stops(base_colors) -> np.ndarray:
+    """
+    Опорні кольори (k, 3). Один колір — як у початковому градієнті: від суміші
+    35% base_color + 65% білого до самого base_color. Кілька кольорів — рівномірні опори.
+    """
+    if isinstance(base_colors, str):
+        base_colors = [base_colors]
+    stops = mcolors.to_rgba_array(base_colors)[:, :3]
+    if len(stops) == 0:
+        raise ValueError("Потрібен хоча б один базовий колір")
+    if len(stops) == 1:
+        stops = np.vstack([0.35 * stops[0] + 0.65, stops[0]])
+    return stops
+
+
+@lru_cache(maxsize=32)
+def _cached_lut(stops: Tuple[Tuple[float, float, float], ...], space: str, size: int) -> np.ndarray:
+    """
+    LUT (size, 3) у sRGB: лінійна інтерполяція опор у просторі space. size - 1 кратне
+    кількості відрізків, тож кожна опора припадає точно на відлік LUT.
+    """
+    stops_arr = np.array(stops)
+    if space == "lab":
+        stops_arr = _srgb_to_lab(stops_arr)
+    elif space != "rgb":
+        raise ValueError("Unknown color space. Use 'rgb' or 'lab'.")
+    per_segment = (size - 1) // (len(stops_arr) - 1)
+    frac = (np.arange(per_segment) / per_segment)[:, None]
+    segments = [a * (1 - frac) + b * frac for a, b in zip(stops_arr[:-1], stops_arr[1:])]
+    lut = np.vstack(segments + [stops_arr[-1:]])
+    if space == "lab":
+        lut = _lab_to_srgb(lut)
+    lut.flags.writeable = False
+    return lut
+
+
+def gradient_lut(base_colors="#1296F0", space: str = "rgb", size: int = LUT_SIZE) -> np.ndarray:
+    """
+    Спільна (кешована, лише для читання) LUT градієнта розміру (size', 3):
+      base_colors — один колір або послідовність опорних кольорів
+      space ∈ {"rgb", "lab"} — у якому просторі інтерполювати (lab — перцептивно рівномірно)
+    size' — найменше число >= size, для якого опори лягають точно на відліки LUT.
+    """
+    if size < 2:
+        raise ValueError("size має бути >= 2")
+    stops = tuple(map(tuple, _gradient_stops(base_colors).tolist()))
+    segments = len(stops) - 1
+    size = -(-(size - 1) // segments) * segments + 1
+    return _cached_lut(stops, space, size)
+
+
+def gradient_colors(n: int, base_colors="#1296F0", space: str = "rgb") -> np.ndarray:
     """
-    Повертає n кольорів від темнішого до світлішого на базі base_color.
-    Уникає ділення на нуль при n=1.
+    Векторна палітра: масив (n, 3) RGB у [0, 1], інтерпольований зі спільної LUT.
+    Для space="rgb" результат збігається з прямою кусково-лінійною інтерполяцією опор
+    (з точністю до округлення float); для "lab" — з точністю до кроку LUT.
+    Підходить напряму як facecolors рендерера.
+    n = 1 дає останній (базовий) колір, як і generate_gradient_colors.
     """
+    lut = gradient_lut(base_colors, space)
     if n <= 1:
-        return [base_color]
+        return lut[-1:].repeat(max(n, 0), axis=0)
+    pos = np.linspace(0.0, len(lut) - 1, n)
+    lo = np.minimum(pos.astype(np.int64), len(lut) - 2)
+    frac = (pos - lo)[:, None]
+    return lut[lo] * (1 - frac) + lut[lo + 1] * frac
 
-    base_rgb = mcolors.to_rgb(base_color)
-    colors: List[str] = []
-    for i in range(n):
-        alpha = i / (n - 1)
-        brightness = 0.35 + 0.65*alpha
 
-        color = tuple(base_rgb[j]*brightness + (1-brightness)*1.0 for j in range(3))
-        colors.append(mcolors.to_hex(color))
-    return colors
+def generate_gradient_colors(n: int, base_color: str = "#1296F0") -> List[str]:
+    """
+    Повертає n кольорів від світлішого до base_color у вигляді hex-рядків.
+    Рахує початкову формулу яскравості векторно (той самий градієнт, що й gradient_colors
+    з одним кольором, але побітово як раніше); рендереру краще передавати масив gradient_colors.
+    """
+    if n <= 1:
+        return [base_color]
+    brightness = (0.35 + 0.65 * (np.arange(n) / (n - 1)))[:, None]
+    rgb = np.array(mcolors.to_rgb(base_color)) * brightness + (1 - brightness) * 1.0
+    return [mcolors.to_hex(c) for c in rgb.tolist()]
+
+
+def benchmark_palettes(n: int = 1_000_000) -> Dict[str, float]:
+    """Час побудови палітри з n кольорів: hex-рядки проти масиву (RGB і Lab)."""
+    runs = {
+        "hex (generate_gradient_colors)": lambda: generate_gradient_colors(n),
+        "масив RGB (gradient_colors)": lambda: gradient_colors(n),
+        "масив Lab, 3 опори": lambda: gradient_colors(n, ["#1296F0", "#F5D547", "#D24A2C"], "lab"),
+    }
+    print(f"Бенчмарк палітр (n = {n:,}):")
+    timings = {}
+    for name, make in runs.items():
+        t0 = time.perf_counter()
+        make()
+        timings[name] = time.perf_counter() - t0
+        print(f"  {name:>32}: {timings[name]:8.3f} с")
+    return timings
 
 
 # ---Обходи без рекурсії ----
@@ -117,46 +241,311 @@ def dfs_order(root: Optional[Node]) -> List[Node]:
     return order
 
 
-# --- Візуалізація обходу ---
-def visualize_traversal(root: Node, traversal: str = "bfs", base_color: str = "#1296F0",
-                        interval: float = 0.6) -> None:
+# --- Ліниві обходи (генератори) ---
+def iter_bfs(root: Optional[Node]) -> Iterator[Node]:
+    """Обхід у ширину як генератор: вузли видаються одразу, пам'ять — лише черга фронту."""
+    if root is None:
+        return
+    q: deque[Node] = deque([root])
+    while q:
+        node = q.popleft()
+        yield node
+        if node.left:
+            q.append(node.left)
+        if node.right:
+            q.append(node.right)
+
+
+def iter_dfs(root: Optional[Node]) -> Iterator[Node]:
+    """Прямий обхід у глибину (pre-order, стек) як генератор — той самий порядок, що й dfs_order."""
+    if root is None:
+        return
+    stack: List[Node] = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+
+def iter_inorder(root: Optional[Node]) -> Iterator[Node]:
+    """Симетричний обхід (лівий, вузол, правий) без рекурсії: стек — лише ліва «гілка»."""
+    stack: List[Node] = []
+    node = root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+def iter_postorder(root: Optional[Node]) -> Iterator[Node]:
     """
-    Анімує обхід дерева:
-      traversal ∈ {"bfs", "dfs"}
-      base_color — колір старту градієнта
-      interval — пауза між кроками (сек)
-    """
-    graph, pos = build_graph(root)
-
-    if traversal == "bfs":
-        order = bfs_order(root)
-        title = "BFS — обхід у ширину"
-    elif traversal == "dfs":
-        order = dfs_order(root)
-        title = "DFS — обхід у глибину (стек)"
-    else:
-        raise ValueError("Unknown traversal type. Use 'bfs' or 'dfs'.")
+    Зворотний обхід (лівий, правий, вузол) без рекурсії: один стек і останній
+    виданий вузол, щоб знати, чи праве піддерево вже пройдене.
+    """
+    stack: List[Node] = []
+    last: Optional[Node] = None
+    node = root
+    while stack or node is not None:
+        if node is not None:
+            stack.append(node)
+            node = node.left
+            continue
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+            node = top.right
+        else:
+            yield top
+            last = stack.pop()
+
+
+def iter_bfs_levels(root: Optional[Node]) -> Iterator[List[Node]]:
+    """BFS по рівнях: видає список вузлів кожної глибини, щоб обробляти їх пакетом."""
+    level = [root] if root is not None else []
+    while level:
+        yield level
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+
+
+TRAVERSALS = {
+    "bfs": (iter_bfs, "BFS — обхід у ширину"),
+    "dfs": (iter_dfs, "DFS — обхід у глибину (стек)"),
+    "inorder": (iter_inorder, "In-order — симетричний обхід"),
+    "postorder": (iter_postorder, "Post-order — зворотний обхід"),
+}
+
+
+def _complete_tree(n: int) -> Optional[Node]:
+    """Повне бінарне дерево з n вузлів (як купа) — для бенчмарків."""
+    nodes = [Node(i) for i in range(n)]
+    for i in range(n // 2):
+        nodes[i].left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            nodes[i].right = nodes[2 * i + 2]
+    return nodes[0] if nodes else None
+
+
+def benchmark_traversals(n: int = 1_000_000, first_k: int = 1000) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Порівнює списки bfs_order/dfs_order з генераторами на дереві з n вузлів:
+    повний прохід (с), перші first_k вузлів (с) і пікова додаткова пам'ять (МБ, tracemalloc).
+    """
+    from itertools import islice
+
+    root = _complete_tree(n)
+
+    def consume(it):
+        count = 0
+        for _ in it:
+            count += 1
+        return count
+
+    runs = {
+        "bfs_order": lambda: bfs_order(root),
+        "iter_bfs": lambda: iter_bfs(root),
+        "iter_bfs_levels": lambda: (node for level in iter_bfs_levels(root) for node in level),
+        "dfs_order": lambda: dfs_order(root),
+        "iter_dfs": lambda: iter_dfs(root),
+        "iter_inorder": lambda: iter_inorder(root),
+        "iter_postorder": lambda: iter_postorder(root),
+    }
+    print(f"Бенчмарк обходів (n = {n:,}, перші {first_k:,}):")
+    print(f"  {'обхід':>16} | {'весь, с':>8} | {'перші k, с':>10} | {'пік, МБ':>8}")
+    results = {}
+    for name, make in runs.items():
+        t0 = time.perf_counter()
+        assert consume(make()) == n
+        full = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        consume(islice(make(), first_k))
+        first = time.perf_counter() - t0
+
+        tracemalloc.start()
+        consume(make())
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+        results[name] = (full, first, peak)
+        print(f"  {name:>16} | {full:8.3f} | {first:10.4f} | {peak:8.2f}")
+    return results
 
-    colors = generate_gradient_colors(len(order), base_color)
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    fig.suptitle(title)
+# --- Візуалізація обходу ---
+def _traversal_order(root: Node, traversal: str) -> Tuple[List[Node], str]:
+    """Порядок відвідування і заголовок для traversal ∈ TRAVERSALS."""
+    if traversal not in TRAVERSALS:
+        raise ValueError("Unknown traversal type. Use one of: " + ", ".join(TRAVERSALS))
+    walk, title = TRAVERSALS[traversal]
+    return list(walk(root)), title
 
-    # Початковий стан
-    draw_tree(graph, pos, ax)
-    plt.pause(0.5)
 
-    for node, color in zip(order, colors):
-        node.color = color
-        # оновлюємо атрибут вузла в графі
-        graph.nodes[node.id]["color"] = node.color
-        draw_tree(graph, pos, ax)
-        plt.pause(interval)
+class TraversalRenderer:
+    """
+    Покроковий рендерер обходу: дерево малюється один раз, далі кожен кадр лише
+    перефарбовує щойно відвідані вузли прямо в масиві кольорів колекції (O(вузлів кадру), а не O(n)).
+      order — вузли у порядку відвідування, colors — їхні кольори (масив (n, 3)/(n, 4)
+              з gradient_colors або будь-що для to_rgba_array)
+      nodes_per_frame — скільки вузлів фарбувати за кадр (для великих дерев)
+    Після кожного кадру час оновлення пишеться у frame_times (сек).
+    """
 
-    plt.show()
+    def __init__(self, root: Node, order: List[Node], colors, ax: Optional[plt.Axes] = None,
+                 figsize=(8, 5), title: Optional[str] = None, nodes_per_frame: int = 1) -> None:
+        if nodes_per_frame < 1:
+            raise ValueError("nodes_per_frame має бути >= 1")
+        self.layout = build_layout(root)
+        index = {node.id: j for j, node in enumerate(self.layout.nodes)}
+        self.order = order
+        self.order_idx = np.fromiter((index[node.id] for node in order), dtype=np.int64, count=len(order))
+        self.colors = mcolors.to_rgba_array(colors)
+        if len(self.colors) != len(order):
+            raise ValueError("Кількість кольорів має збігатися з кількістю вузлів обходу")
+        self.nodes_per_frame = nodes_per_frame
+
+        if ax is None:
+            _, ax = plt.subplots(figsize=figsize)
+        self.ax = ax
+        self.fig = ax.figure
+        if title is not None:
+            self.fig.suptitle(title)
+        self.initial = mcolors.to_rgba_array([node.color for node in self.layout.nodes])
+        self.facecolors = self.initial.copy()
+        labels = [node.val for node in self.layout.nodes]
+        self.nodes = draw_collections(ax, self.layout.pos, self.layout.parent, self.facecolors, labels)
+        # set_facecolors щоразу перетворює весь n×4 масив; тому далі пишемо прямо у внутрішній
+        # масив колекції (get_facecolor повертає його без копії) і лише позначаємо її застарілою.
+        # update_scalarmappable викликається заздалегідь: перше малювання інакше підмінило б масив
+        self.nodes.update_scalarmappable()
+        self.facecolors = self.nodes.get_facecolor()
+        ax.margins(0.15)
+        # підписи лежать над вузлами, тож при блітингу їх теж треба перемальовувати
+        self.artists = [self.nodes, *ax.texts]
+        self.frame_times: List[float] = []
+
+    @property
+    def num_frames(self) -> int:
+        return -(-len(self.order) // self.nodes_per_frame)
+
+    def reset(self) -> list:
+        """Повертає початкові кольори (перший кадр анімації)."""
+        self.facecolors[:] = self.initial
+        self.nodes.stale = True
+        self.frame_times.clear()
+        return self.artists
+
+    def update(self, frame: int) -> list:
+        """Фарбує вузли кадру frame і повертає змінені художники (для blit)."""
+        t0 = time.perf_counter()
+        lo = frame * self.nodes_per_frame
+        hi = min(lo + self.nodes_per_frame, len(self.order))
+        self.facecolors[self.order_idx[lo:hi]] = self.colors[lo:hi]
+        self.nodes.stale = True
+        self.frame_times.append(time.perf_counter() - t0)
+        return self.artists
+
+    def commit_colors(self) -> None:
+        """Записує фінальні кольори у node.color (як робила початкова реалізація)."""
+        for node, rgba in zip(self.layout.nodes, self.facecolors):
+            node.color = mcolors.to_hex(rgba)
+
+    def animate(self, interval: float = 0.6) -> animation.FuncAnimation:
+        """Інтерактивна анімація з блітингом: перемальовуються лише вузли й підписи."""
+        return animation.FuncAnimation(self.fig, self.update, frames=self.num_frames, init_func=self.reset,
+                                       interval=interval * 1000, blit=True, repeat=False)
+
+    def export(self, output: str, fps: float = 2.0, dpi: int = 100) -> List[float]:
+        """
+        Безголовий експорт без plt.pause: .gif (Pillow), .mp4 (ffmpeg) або каталог PNG-кадрів
+        (будь-який інший шлях). Повертає повний час кожного кадру, включно з записом.
+        """
+        ext = os.path.splitext(output)[1].lower()
+        if ext == ".gif":
+            writer = animation.PillowWriter(fps=fps)
+        elif ext == ".mp4":
+            if not animation.writers.is_available("ffmpeg"):
+                raise ValueError("Для експорту в .mp4 потрібен ffmpeg")
+            writer = animation.FFMpegWriter(fps=fps)
+        else:
+            writer = None
+            os.makedirs(output, exist_ok=True)
+
+        self.reset()
+        totals: List[float] = []
+        if writer is None:
+            for frame in range(self.num_frames + 1):
+                t0 = time.perf_counter()
+                if frame:
+                    self.update(frame - 1)
+                self.fig.savefig(os.path.join(output, f"frame_{frame:05d}.png"), dpi=dpi)
+                totals.append(time.perf_counter() - t0)
+        else:
+            with writer.saving(self.fig, output, dpi):
+                for frame in range(self.num_frames + 1):
+                    t0 = time.perf_counter()
+                    if frame:
+                        self.update(frame - 1)
+                    writer.grab_frame()
+                    totals.append(time.perf_counter() - t0)
+        return totals
+
+
+def print_frame_timing(frame_times: List[float], label: str = "кадр") -> None:
+    """Короткий звіт про час кадрів: кількість, середнє, максимум, сумарний час."""
+    if not frame_times:
+        print("Кадрів немає.")
+        return
+    times = np.asarray(frame_times) * 1000
+    print(f"{len(times)} × {label}: середнє {times.mean():.2f} мс, максимум {times.max():.2f} мс, "
+          f"разом {times.sum() / 1000:.2f} с")
+
+
+def visualize_traversal(root: Node, traversal: str = "bfs", base_color="#1296F0",
+                        interval: float = 0.6, output: Optional[str] = None, fps: float = 2.0,
+                        nodes_per_frame: int = 1, stats: dict = None, space: str = "rgb") -> None:
+    """
+    Анімує обхід дерева:
+      traversal ∈ {"bfs", "dfs", "inorder", "postorder"}
+      base_color — колір градієнта або послідовність опорних кольорів
+      interval — пауза між кроками (сек) в інтерактивному режимі
+      output — якщо задано, анімація пишеться у .gif/.mp4/каталог кадрів без вікна
+      fps — частота кадрів для output
+      nodes_per_frame — скільки вузлів фарбувати за кадр
+      space ∈ {"rgb", "lab"} — простір інтерполяції градієнта
+    Якщо передано stats, туди пишеться "frame_times" — час кожного кадру (сек).
+    """
+    order, title = _traversal_order(root, traversal)
+    colors = gradient_colors(len(order), base_color, space)
+    renderer = TraversalRenderer(root, order, colors, title=title, nodes_per_frame=nodes_per_frame)
+
+    if output is not None:
+        frame_times = renderer.export(output, fps=fps)
+        plt.close(renderer.fig)
+        print_frame_timing(frame_times, label=f"кадр → {output}")
+    else:
+        anim = renderer.animate(interval)  # noqa: F841 — посилання тримає анімацію живою до закриття вікна
+        plt.show()
+        frame_times = renderer.frame_times
+        print_frame_timing(frame_times, label="оновлення кадру")
+    renderer.commit_colors()
+    if stats is not None:
+        stats["frame_times"] = list(frame_times)
 
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_traversals()
+        benchmark_palettes()
+        sys.exit(0)
+
+    # --export DIR — записати обидві анімації у DIR/bfs.gif і DIR/dfs.gif без вікна
+    export_dir = sys.argv[sys.argv.index("--export") + 1] if "--export" in sys.argv else None
+
     # Будуємо дерево
     root = Node(0)
     root.left = Node(4)
@@ -166,7 +555,8 @@ if __name__ == "__main__":
     root.right.left = Node(3)
 
     print("BFS:")
-    visualize_traversal(root, traversal="bfs", base_color="#1296F0", interval=0.5)
+    visualize_traversal(root, traversal="bfs", base_color="#1296F0", interval=0.5,
+                        output=export_dir and os.path.join(export_dir, "bfs.gif"))
 
     # Створюємо нове дерево (щоб кольори не перетікали)
     root2 = Node(0)
@@ -177,4 +567,5 @@ if __name__ == "__main__":
     root2.right.left = Node(3)
 
     print("DFS:")
-    visualize_traversal(root2, traversal="dfs", base_color="#D24A2C", interval=0.5)
+    visualize_traversal(root2, traversal="dfs", base_color="#D24A2C", interval=0.5,
+                        output=export_dir and os.path.join(export_dir, "dfs.gif"))
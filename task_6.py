@@ -1,4 +1,21 @@
-from typing import Dict, Tuple, List
+import random
+import sys
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Tuple, List, Optional
+
+import numpy as np
+
+# Скільки байт дозволено на бітову матрицю рішень (n × (budget+1) біт) у режимі "rolling";
+# якщо більше — відновлення набору робиться розділяй-і-володарюй (Хіршберг)
+DECISION_BITS_LIMIT = 64 * 1024 * 1024
+
+# Межа кількості клітинок DP (n × розмір таблиці), після якої mode="auto" обирає FPTAS
+MAX_DP_CELLS = 10 ** 10
+
+# «Нескінченна» вартість для калорійного DP (запас від переповнення при додаванні двох INF)
+INF_COST = np.iinfo(np.int64).max // 4
 
 
 items: Dict[str, Dict[str, int]] = {
@@ -18,16 +35,21 @@ def compute_totals(selected: List[str], items: Dict[str, Dict[str, int]]) -> Tup
     return total_cal, total_cost
 
 
+def _ratio_order(items: Dict[str, Dict[str, int]]) -> List[Tuple[str, Dict[str, int]]]:
+    """Страви за спаданням ratio = calories/cost (за рівності — за калоріями)."""
+    return sorted(
+        items.items(),
+        key=lambda x: (x[1]["calories"] / x[1]["cost"], x[1]["calories"]),
+        reverse=True,
+    )
+
+
 def greedy_algorithm(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
     """
     Жадібний підхід: обираємо за найбільшим ratio = calories/cost.
     Повертає (список страв, сумарні калорії, сумарна вартість).
     """
-    sorted_items = sorted(
-        items.items(),
-        key=lambda x: (x[1]["calories"] / x[1]["cost"], x[1]["calories"]),
-        reverse=True,
-    )
+    sorted_items = _ratio_order(items)
 
     selected: List[str] = []
     total_cost = 0
@@ -41,11 +63,36 @@ def greedy_algorithm(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[Lis
     return selected, total_cal, total_cost
 
 
-def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[List[str], int, int]:
+def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int,
+                        mode: str = "auto", epsilon: float = 0.1) -> Tuple[List[str], int, int]:
     """
     максимізуємо калорійність при обмеженні бюджету.
+      mode — яку таблицю будувати:
+        "table"    — повна таблиця (n+1)×(budget+1) (початкова реалізація)
+        "rolling"  — ковзний NumPy-масив за бюджетом, пам'ять O(budget)
+        "gcd"      — як "rolling", але вартості й бюджет поділені на їхній НСД
+        "calories" — двоїстий DP: мінімальна вартість для кожної суми калорій
+        "fptas"    — наближений розв'язок з точністю (1 - epsilon)
+        "auto"     — вибір за select_dp_mode
     Повертає (список страв у оптимальному наборі, калорії, вартість).
     """
+    if mode == "auto":
+        mode = select_dp_mode(items, budget)
+    if mode != "table":
+        solvers = {
+            "rolling": _solve_by_budget,
+            "gcd": _solve_by_gcd,
+            "calories": _solve_by_calories,
+            "fptas": lambda c, v, b: _solve_fptas(c, v, b, epsilon),
+        }
+        if mode not in solvers:
+            raise ValueError("Unknown mode. Use 'auto', 'table', 'rolling', 'gcd', 'calories' or 'fptas'.")
+        item_list = list(items.items())
+        costs, cals = _item_arrays(item_list)
+        res = [item_list[i][0] for i in solvers[mode](costs, cals, budget)]
+        total_cal, total_cost = compute_totals(res, items)
+        return res, total_cal, total_cost
+
     item_list = list(items.items())
     n = len(item_list)
 
@@ -74,11 +121,397 @@ def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int) -> Tuple[
     return res, total_cal, total_cost
 
 
+def _item_arrays(item_list: List[Tuple[str, Dict[str, int]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Вартості та калорії страв як масиви int64."""
+    costs = np.fromiter((data["cost"] for _, data in item_list), dtype=np.int64, count=len(item_list))
+    cals = np.fromiter((data["calories"] for _, data in item_list), dtype=np.int64, count=len(item_list))
+    return costs, cals
+
+
+def _rolling_values(costs: np.ndarray, cals: np.ndarray, budget: int,
+                    decisions: List[np.ndarray] = None) -> np.ndarray:
+    """
+    Одновимірний DP: dp[j] — макс. калорії при вартості <= j. Кожна страва обробляється
+    векторно (зсув масиву + np.maximum), пам'ять O(budget).
+    Якщо передано decisions, додає туди упаковані біти «страву взято» для кожного j.
+    """
+    dp = np.zeros(budget + 1, dtype=np.int64)
+    for cost, cal in zip(costs.tolist(), cals.tolist()):
+        if cost > budget:
+            if decisions is not None:
+                decisions.append(np.zeros((budget + 8) // 8, dtype=np.uint8))
+            continue
+        cand = dp[:budget + 1 - cost] + cal
+        if decisions is not None:
+            take = np.zeros(budget + 1, dtype=bool)
+            take[cost:] = cand > dp[cost:]
+            decisions.append(np.packbits(take))
+        np.maximum(dp[cost:], cand, out=dp[cost:])
+    return dp
+
+
+def _reconstruct_bitset(costs: np.ndarray, cals: np.ndarray, budget: int) -> List[int]:
+    """Відновлення набору через бітову матрицю рішень (n × (budget+1) біт)."""
+    decisions: List[np.ndarray] = []
+    _rolling_values(costs, cals, budget, decisions)
+    res: List[int] = []
+    j = budget
+    for i in range(len(costs) - 1, -1, -1):
+        if (decisions[i][j >> 3] >> (7 - (j & 7))) & 1:
+            res.append(i)
+            j -= int(costs[i])
+    res.reverse()
+    return res
+
+
+def _reconstruct_hirschberg(costs: np.ndarray, cals: np.ndarray, budget: int) -> List[int]:
+    """
+    Відновлення набору в пам'яті O(budget) (схема Хіршберга): ділимо страви навпіл,
+    рахуємо DP для лівої та правої половин і шукаємо розподіл бюджету c + (budget - c),
+    що дає максимум; далі рекурсивно розв'язуємо половини з бюджетами c і budget - c.
+    Підзадачі, що вміщуються в DECISION_BITS_LIMIT, добиваються бітовою матрицею.
+    """
+    def solve(lo: int, hi: int, cap: int) -> List[int]:
+        if lo == hi:
+            return []
+        if hi - lo == 1 or (hi - lo) * (cap + 1) <= DECISION_BITS_LIMIT * 8:
+            return [lo + i for i in _reconstruct_bitset(costs[lo:hi], cals[lo:hi], cap)]
+        mid = (lo + hi) // 2
+        left = _rolling_values(costs[lo:mid], cals[lo:mid], cap)
+        right = _rolling_values(costs[mid:hi], cals[mid:hi], cap)
+        c = int(np.argmax(left + right[::-1]))
+        return solve(lo, mid, c) + solve(mid, hi, cap - c)
+
+    return solve(0, len(costs), budget)
+
+
+def _solve_by_budget(costs: np.ndarray, cals: np.ndarray, budget: int) -> List[int]:
+    """
+    Розв'язок ковзним NumPy-масивом, проіндексованим бюджетом (пам'ять O(budget)).
+    Набір відновлюється бітовою матрицею рішень, а якщо вона не вміщується в
+    DECISION_BITS_LIMIT — методом Хіршберга. Повертає індекси обраних страв.
+    """
+    if len(costs) * (budget + 1) <= DECISION_BITS_LIMIT * 8:
+        return _reconstruct_bitset(costs, cals, budget)
+    return _reconstruct_hirschberg(costs, cals, budget)
+
+
+def _cost_gcd(costs: np.ndarray) -> int:
+    """НСД ненульових вартостей (1, якщо їх немає)."""
+    positive = costs[costs > 0]
+    return int(np.gcd.reduce(positive)) if positive.size else 1
+
+
+def _solve_by_gcd(costs: np.ndarray, cals: np.ndarray, budget: int) -> List[int]:
+    """Ділить вартості й бюджет на спільний НСД вартостей — таблиця стає у g разів коротшою."""
+    g = _cost_gcd(costs)
+    return _solve_by_budget(costs // g, cals, budget // g)
+
+
+def _min_cost_values(costs: np.ndarray, cals: np.ndarray, total: int,
+                     decisions: List[np.ndarray] = None) -> np.ndarray:
+    """
+    Двоїстий DP: dp[c] — мінімальна вартість набору з рівно c калоріями (c <= total).
+    Якщо передано decisions, додає туди упаковані біти «страву взято» для кожного c.
+    """
+    dp = np.full(total + 1, INF_COST, dtype=np.int64)
+    dp[0] = 0
+    for cost, cal in zip(costs.tolist(), cals.tolist()):
+        if cal == 0 or cal > total:
+            if decisions is not None:
+                decisions.append(np.zeros((total + 8) // 8, dtype=np.uint8))
+            continue
+        cand = dp[:total + 1 - cal] + cost
+        if decisions is not None:
+            take = np.zeros(total + 1, dtype=bool)
+            take[cal:] = cand < dp[cal:]
+            decisions.append(np.packbits(take))
+        np.minimum(dp[cal:], cand, out=dp[cal:])
+    return dp
+
+
+def _reconstruct_min_cost(costs: np.ndarray, cals: np.ndarray, target: int) -> List[int]:
+    """
+    Відновлює найдешевший набір рівно з target калорій: бітовою матрицею, якщо вона
+    вміщується в DECISION_BITS_LIMIT, інакше поділом навпіл за Хіршбергом.
+    """
+    def solve(lo: int, hi: int, cal_target: int) -> List[int]:
+        if lo == hi:
+            return []
+        if hi - lo == 1 or (hi - lo) * (cal_target + 1) <= DECISION_BITS_LIMIT * 8:
+            decisions: List[np.ndarray] = []
+            _min_cost_values(costs[lo:hi], cals[lo:hi], cal_target, decisions)
+            res: List[int] = []
+            c = cal_target
+            for i in range(hi - lo - 1, -1, -1):
+                if (decisions[i][c >> 3] >> (7 - (c & 7))) & 1:
+                    res.append(lo + i)
+                    c -= int(cals[lo + i])
+            res.reverse()
+            return res
+        mid = (lo + hi) // 2
+        left = _min_cost_values(costs[lo:mid], cals[lo:mid], cal_target)
+        right = _min_cost_values(costs[mid:hi], cals[mid:hi], cal_target)
+        c = int(np.argmin(left + right[::-1]))
+        return solve(lo, mid, c) + solve(mid, hi, cal_target - c)
+
+    return solve(0, len(costs), cal_target=target)
+
+
+def _solve_by_calories(costs: np.ndarray, cals: np.ndarray, budget: int) -> List[int]:
+    """
+    Таблиця, проіндексована калоріями (розмір — сума калорій): вигідна, коли бюджет
+    величезний, а сумарна калорійність мала. Відповідь — найбільше c з dp[c] <= budget.
+    """
+    fits = costs <= budget
+    idx = np.flatnonzero(fits)
+    costs, cals = costs[fits], cals[fits]
+    dp = _min_cost_values(costs, cals, int(cals.sum()))
+    target = int(np.flatnonzero(dp <= budget).max())
+    return [int(idx[i]) for i in _reconstruct_min_cost(costs, cals, target)]
+
+
+def _solve_fptas(costs: np.ndarray, cals: np.ndarray, budget: int, epsilon: float) -> List[int]:
+    """
+    FPTAS: калорії масштабуються кроком K = epsilon * max_cal / n і округлюються вниз,
+    після чого задача розв'язується калорійним DP. Гарантія: калорії >= (1 - epsilon) * OPT,
+    розмір таблиці — O(n^2 / epsilon) незалежно від бюджету та величини калорій.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon має бути в інтервалі (0, 1)")
+    fits = costs <= budget
+    if not fits.any():
+        return []
+    k = epsilon * int(cals[fits].max()) / int(fits.sum())
+    if k <= 1:
+        return _solve_by_calories(costs, cals, budget)
+    scaled = (cals // k).astype(np.int64)
+    return _solve_by_calories(costs, scaled, budget)
+
+
+def select_dp_mode(items: Dict[str, Dict[str, int]], budget: int) -> str:
+    """
+    Обирає таблицю для dynamic_programming(mode="auto") за розміром входу:
+      "calories" — якщо сума калорій менша за стиснутий бюджет,
+      "gcd" — якщо вартості мають спільний дільник > 1,
+      "rolling" — звичайна таблиця за бюджетом,
+      "fptas" — якщо жодна таблиця не вміщується в MAX_DP_CELLS.
+    """
+    costs, cals = _item_arrays(list(items.items()))
+    n = len(costs)
+    g = _cost_gcd(costs)
+    budget_cells = n * (budget // g + 1)
+    calorie_cells = n * (int(cals[costs <= budget].sum()) + 1)
+    if min(budget_cells, calorie_cells) > MAX_DP_CELLS:
+        return "fptas"
+    if calorie_cells < budget_cells:
+        return "calories"
+    return "gcd" if g > 1 else "rolling"
+
+
+def branch_and_bound(items: Dict[str, Dict[str, int]], budget: int,
+                     stats: Optional[Dict[str, float]] = None) -> Tuple[List[str], int, int]:
+    """
+    Точний метод гілок і меж (DFS без рекурсії). Страви впорядковані як у greedy_algorithm,
+    тож верхня межа вузла — дробова релаксація: беремо наступні страви цілком, поки
+    вміщуються, і частку першої, що не вміщується (O(log n) через префіксні суми).
+    Не будує таблиць, тому час не залежить від величини бюджету.
+    Якщо передано stats, записує туди "nodes" (відвідані вузли) і "time" (секунди).
+    Повертає (список страв, калорії, вартість).
+    """
+    t0 = time.perf_counter()
+    # страви з нульовою вартістю беремо завжди, а задорогі не розглядаємо взагалі
+    free = [name for name, data in items.items() if data["cost"] == 0 and data["calories"] > 0]
+    order = _ratio_order({name: data for name, data in items.items() if 0 < data["cost"] <= budget})
+    costs = [data["cost"] for _, data in order]
+    cals = [data["calories"] for _, data in order]
+    n = len(order)
+    pref_cost = [0, *accumulate(costs)]
+    pref_cal = [0, *accumulate(cals)]
+
+    def upper_bound(i: int, cap: int, value: int) -> int:
+        k = bisect_right(pref_cost, pref_cost[i] + cap, lo=i) - 1
+        bound = value + pref_cal[k] - pref_cal[i]
+        if k < n:
+            bound += (cap - (pref_cost[k] - pref_cost[i])) * cals[k] // costs[k]
+        return bound
+
+    # початкова нижня межа — жадібний розв'язок
+    best_value, best_taken = 0, None
+    cap = budget
+    for i in range(n):
+        if costs[i] <= cap:
+            cap -= costs[i]
+            best_value += cals[i]
+            best_taken = (i, best_taken)
+
+    nodes = 0
+    # вузол: (індекс наступної страви, залишок бюджету, калорії, обрані — зв'язний кортеж)
+    stack = [(0, budget, 0, None)]
+    while stack:
+        i, cap, value, taken = stack.pop()
+        nodes += 1
+        if value > best_value:
+            best_value, best_taken = value, taken
+        if i == n or upper_bound(i, cap, value) <= best_value:
+            continue
+        stack.append((i + 1, cap, value, taken))
+        if costs[i] <= cap:
+            stack.append((i + 1, cap - costs[i], value + cals[i], (i, taken)))
+
+    chosen: List[int] = []
+    while best_taken is not None:
+        chosen.append(best_taken[0])
+        best_taken = best_taken[1]
+    res = free + [order[i][0] for i in sorted(chosen)]
+
+    if stats is not None:
+        stats["nodes"] = nodes
+        stats["time"] = time.perf_counter() - t0
+    total_cal, total_cost = compute_totals(res, items)
+    return res, total_cal, total_cost
+
+
+class KnapsackIndex:
+    """
+    Попередньо обчислений розв'язувач для багатьох бюджетів на одному меню.
+    Один прохід ковзного DP до max_budget зберігає бітову матрицю рішень
+    (n × (max_budget/g + 1) біт, g — НСД вартостей), після чого query(budget) для будь-якого
+    budget <= max_budget відновлює набір за O(n). Відповіді кешуються; якщо меню
+    змінилося, індекс перебудовується при наступному запиті.
+    """
+
+    def __init__(self, items: Dict[str, Dict[str, int]], max_budget: int) -> None:
+        if max_budget < 0:
+            raise ValueError("max_budget має бути >= 0")
+        self.items = items
+        self.max_budget = max_budget
+        self.rebuilds = 0
+        self._build()
+
+    @staticmethod
+    def _fingerprint(items: Dict[str, Dict[str, int]]) -> Tuple[Tuple[str, int, int], ...]:
+        return tuple((name, data["cost"], data["calories"]) for name, data in items.items())
+
+    def _build(self) -> None:
+        item_list = list(self.items.items())
+        self.names = [name for name, _ in item_list]
+        self.costs, self.cals = _item_arrays(item_list)
+        self.gcd = _cost_gcd(self.costs)
+        decisions: List[np.ndarray] = []
+        self.values = _rolling_values(self.costs // self.gcd, self.cals, self.max_budget // self.gcd, decisions)
+        width = (self.max_budget // self.gcd + 8) // 8
+        self.decisions = np.vstack(decisions) if decisions else np.zeros((0, width), dtype=np.uint8)
+        self.fingerprint = self._fingerprint(self.items)
+        self._cache: Dict[int, Tuple[List[str], int, int]] = {}
+
+    def is_valid(self) -> bool:
+        """Чи відповідає індекс поточному вмісту items."""
+        return self._fingerprint(self.items) == self.fingerprint
+
+    def best_calories(self, budget: int) -> int:
+        """Максимальні калорії для бюджету — за O(1), без відновлення набору."""
+        self._check_budget(budget)
+        return int(self.values[budget // self.gcd])
+
+    def query(self, budget: int) -> Tuple[List[str], int, int]:
+        """Оптимальний набір для бюджету: (список страв, калорії, вартість)."""
+        self._check_budget(budget)
+        if budget in self._cache:
+            return self._cache[budget]
+        res: List[str] = []
+        j = budget // self.gcd
+        for i in range(len(self.names) - 1, -1, -1):
+            if (self.decisions[i, j >> 3] >> (7 - (j & 7))) & 1:
+                res.append(self.names[i])
+                j -= int(self.costs[i]) // self.gcd
+        res.reverse()
+        total_cal, total_cost = compute_totals(res, self.items)
+        self._cache[budget] = (res, total_cal, total_cost)
+        return self._cache[budget]
+
+    def _check_budget(self, budget: int) -> None:
+        if not 0 <= budget <= self.max_budget:
+            raise ValueError(f"Бюджет {budget} поза межами індексу [0, {self.max_budget}]")
+        if not self.is_valid():
+            self._build()
+            self.rebuilds += 1
+
+    def save(self, path: str) -> None:
+        """
+        Зберігає індекс у .npz, щоб новий процес міг завантажити його без перерахунку.
+        Пише через відкритий файл, тож np.savez не дописує .npz і load(path) знаходить файл.
+        """
+        with open(path, "wb") as f:
+            np.savez(f, names=np.array(self.names, dtype=str), costs=self.costs, cals=self.cals,
+                     values=self.values, decisions=self.decisions,
+                     meta=np.array([self.max_budget, self.gcd], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str, items: Dict[str, Dict[str, int]]) -> "KnapsackIndex":
+        """
+        Завантажує індекс, збережений save(). Якщо items не збігаються зі збереженим
+        меню, індекс одразу перебудовується.
+        """
+        with np.load(path) as data:
+            index = cls.__new__(cls)
+            index.items = items
+            index.max_budget, index.gcd = (int(x) for x in data["meta"])
+            index.names = data["names"].tolist()
+            index.costs, index.cals = data["costs"], data["cals"]
+            index.values, index.decisions = data["values"], data["decisions"]
+        index.fingerprint = tuple(zip(index.names, index.costs.tolist(), index.cals.tolist()))
+        index._cache = {}
+        index.rebuilds = 0
+        if not index.is_valid():
+            index._build()
+            index.rebuilds += 1
+        return index
+
+
+def generate_menu(n: int, max_cost: int = 1000, max_calories: int = 1000,
+                  seed: int = 42) -> Dict[str, Dict[str, int]]:
+    """Генерує випадкове меню з n страв (для бенчмарків)."""
+    rng = random.Random(seed)
+    return {
+        f"item-{i}": {"cost": rng.randint(1, max_cost), "calories": rng.randint(1, max_calories)}
+        for i in range(n)
+    }
+
+
+def benchmark_solvers(sizes=(10, 20, 40, 80, 160), max_cost: int = 1000, seed: int = 42) -> None:
+    """
+    Порівнює dynamic_programming і branch_and_bound на згенерованих меню.
+    Бюджет — половина сумарної вартості меню.
+    """
+    print(f"| {'n':>5} | {'бюджет':>9} | {'DP, с':>8} | {'B&B, с':>8} | {'вузли B&B':>10} | калорії |")
+    print(f"|{'-' * 7}|{'-' * 11}|{'-' * 10}|{'-' * 10}|{'-' * 12}|{'-' * 9}|")
+    for n in sizes:
+        menu = generate_menu(n, max_cost=max_cost, seed=seed + n)
+        menu_budget = sum(data["cost"] for data in menu.values()) // 2
+
+        t0 = time.perf_counter()
+        _, dp_cal, _ = dynamic_programming(menu, menu_budget)
+        dp_time = time.perf_counter() - t0
+
+        stats: Dict[str, float] = {}
+        _, bb_cal, _ = branch_and_bound(menu, menu_budget, stats)
+        assert bb_cal == dp_cal, "branch_and_bound і dynamic_programming дали різні калорії"
+        print(f"| {n:5d} | {menu_budget:9d} | {dp_time:8.4f} | {stats['time']:8.4f} | "
+              f"{stats['nodes']:10d} | {bb_cal:7d} |")
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_solvers()
+        sys.exit(0)
+
     budget = 100
 
     g_items, g_cal, g_cost = greedy_algorithm(items, budget)
     d_items, d_cal, d_cost = dynamic_programming(items, budget)
+    bb_stats: Dict[str, float] = {}
+    b_items, b_cal, b_cost = branch_and_bound(items, budget, bb_stats)
 
     print(f"Бюджет: {budget}\n")
 
@@ -86,6 +519,16 @@ if __name__ == "__main__":
     print("  набір:", g_items)
     print(f"  калорії = {g_cal}, вартість = {g_cost}\n")
 
-    print("Динамічне програмування:")
+    print(f"Динамічне програмування (таблиця: {select_dp_mode(items, budget)}):")
     print("  набір:", d_items)
     print(f"  калорії = {d_cal}, вартість = {d_cost}")
+
+    print("\nМетод гілок і меж:")
+    print("  набір:", b_items)
+    print(f"  калорії = {b_cal}, вартість = {b_cost} (вузлів: {bb_stats['nodes']})")
+
+    index = KnapsackIndex(items, max_budget=200)
+    print("\nІндекс для багатьох бюджетів:")
+    for b in (30, 60, 100, 150, 200):
+        q_items, q_cal, q_cost = index.query(b)
+        print(f"  бюджет {b:3d}: калорії = {q_cal}, вартість = {q_cost}, набір = {q_items}")
@@ -1,40 +1,226 @@
 import random
 import math
+import time
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import matplotlib.pyplot as plt
 
-def analytic_probabilities():
-    counts = {s: c for s, c in zip(range(2, 13), [1,2,3,4,5,6,5,4,3,2,1])}
-    return {s: counts[s] / 36 * 100 for s in range(2, 13)}
+# Скільки кидків генеруємо за один раз у векторизованому рушії (обмежує пам'ять)
+CHUNK_SIZE = 1_000_000
+
+# z-квантиль для 95% довірчого інтервалу
+Z_95 = 1.96
+
+# Починаючи з якої довжини згортки вигідніше рахувати її через FFT
+FFT_THRESHOLD = 64
+
+
+def sum_range(num_dice=2, faces=6):
+    """Можливі суми для num_dice кубиків із faces гранями: num_dice … num_dice*faces."""
+    if num_dice < 1 or faces < 1:
+        raise ValueError("num_dice і faces мають бути >= 1")
+    return range(num_dice, num_dice * faces + 1)
+
+
+def _dice_config(probs):
+    """Відновлює (num_dice, faces) за ключами словника сум."""
+    lo, hi = min(probs), max(probs)
+    return lo, hi // lo
+
+
+def _int_dtype(max_value):
+    """Найменший знаковий цілий тип, у який вміщується max_value."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _convolve(a, b):
+    """Згортка двох PMF: пряма для коротких масивів, через rFFT — для довгих."""
+    if min(len(a), len(b)) < FFT_THRESHOLD:
+        return np.convolve(a, b)
+    size = len(a) + len(b) - 1
+    n_fft = 1 << (size - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, n_fft) * np.fft.rfft(b, n_fft), n_fft)[:size]
+    # похибка округлення FFT може дати крихітні від'ємні значення на «хвостах»
+    return np.clip(out, 0.0, None)
+
+
+def _sum_pmf(num_dice, faces):
+    """
+    PMF суми num_dice кубиків як num_dice-кратна згортка PMF одного кубика
+    (піднесення до степеня через квадрати — O(log N) згорток замість K^N доданків).
+    Індекс масиву = сума - num_dice.
+    """
+    die = np.full(faces, 1.0 / faces)
+    result = np.ones(1)
+    power = die
+    n = num_dice
+    while n:
+        if n & 1:
+            result = _convolve(result, power)
+        n >>= 1
+        if n:
+            power = _convolve(power, power)
+    return result / result.sum()
+
+
+def analytic_probabilities(num_dice=2, faces=6):
+    """Точні ймовірності (у %) усіх сум для num_dice кубиків із faces гранями."""
+    pmf = _sum_pmf(num_dice, faces)
+    return {s: float(p) * 100 for s, p in zip(sum_range(num_dice, faces), pmf)}
+
 
-def monte_carlo_dice_simulation(num_rolls=1_000_000, seed=42):
+def _count_sums_loop(num_rolls, seed, num_dice=2, faces=6):
+    """Початкова реалізація: чистий Python, num_dice викликів randint на кидок."""
     rng = random.Random(seed)
-    sums_count = {s: 0 for s in range(2, 13)}
+    sums_count = {s: 0 for s in sum_range(num_dice, faces)}
     for _ in range(num_rolls):
-        total = rng.randint(1, 6) + rng.randint(1, 6)
+        total = sum(rng.randint(1, faces) for _ in range(num_dice))
         sums_count[total] += 1
+    return sums_count
+
+
+def _count_sums_numpy(num_rolls, seed, chunk_size=CHUNK_SIZE, num_dice=2, faces=6):
+    """
+    Векторизований підрахунок: кидки генеруються блоками по chunk_size,
+    частоти сум накопичуються через np.bincount. Пам'ять — O(chunk_size * num_dice).
+    seed — ціле число або np.random.SeedSequence (для потоків воркерів).
+    Повертає масив частот довжини num_dice*faces + 1 (індекс = сума).
+    """
+    rng = np.random.default_rng(seed)
+    max_sum = num_dice * faces
+    roll_dtype, sum_dtype = _int_dtype(faces), _int_dtype(max_sum)
+    counts = np.zeros(max_sum + 1, dtype=np.int64)
+    remaining = num_rolls
+    while remaining > 0:
+        m = min(chunk_size, remaining)
+        rolls = rng.integers(1, faces + 1, size=(m, num_dice), dtype=roll_dtype)
+        counts += np.bincount(rolls.sum(axis=1, dtype=sum_dtype), minlength=max_sum + 1)
+        remaining -= m
+    return counts
+
+
+def _count_sums_parallel(num_rolls, seed, workers, chunk_size=CHUNK_SIZE, num_dice=2, faces=6):
+    """
+    Розбиває num_rolls між workers процесами. Кожен воркер отримує власний
+    незалежний потік з SeedSequence(seed).spawn(workers), тож пара (seed, workers)
+    завжди дає ті самі сумарні частоти.
+    """
+    child_seeds = np.random.SeedSequence(seed).spawn(workers)
+    base, extra = divmod(num_rolls, workers)
+    shares = [base + (1 if i < extra else 0) for i in range(workers)]
+
+    counts = np.zeros(num_dice * faces + 1, dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_count_sums_numpy, shares, child_seeds, [chunk_size] * workers,
+                             [num_dice] * workers, [faces] * workers):
+            counts += part
+    return counts
+
+
+def _ci_half_widths(counts, n_rolls, z=Z_95):
+    """
+    Напівширини CI (у п.п.) для кожної суми. Частка згладжена як у інтервалі
+    Вілсона, щоб суми, які ще не випали (count = 0), не давали хибну нульову ширину.
+    """
+    p = (counts + z * z / 2) / (n_rolls + z * z)
+    return z * np.sqrt(p * (1 - p) / n_rolls) * 100
+
+
+def _count_sums_adaptive(max_rolls, seed, tolerance, chunk_size=CHUNK_SIZE, num_dice=2, faces=6):
+    """
+    Послідовний режим: кидає блоками по chunk_size і після кожного блоку
+    оновлює напівширини 95% CI. Зупиняється, щойно всі вони < tolerance (п.п.),
+    або коли вичерпано бюджет max_rolls. Повертає (частоти, фактична кількість кидків).
+    """
+    rng = np.random.default_rng(seed)
+    sums = sum_range(num_dice, faces)
+    counts = np.zeros(num_dice * faces + 1, dtype=np.int64)
+    n = 0
+    while n < max_rolls:
+        batch = min(chunk_size, max_rolls - n)
+        counts += _count_sums_numpy(batch, rng, chunk_size, num_dice, faces)
+        n += batch
+        if _ci_half_widths(counts[sums.start:], n).max() < tolerance:
+            break
+    return counts, n
+
+
+def monte_carlo_dice_simulation(num_rolls=1_000_000, seed=42, engine="numpy", chunk_size=CHUNK_SIZE,
+                                workers=1, num_dice=2, faces=6, tolerance=None):
+    """
+    Симулює num_rolls кидків num_dice кубиків із faces гранями.
+      engine ∈ {"numpy", "loop"} — векторизований блоковий рушій або початковий цикл
+      chunk_size — розмір блоку для "numpy" (обмежує пікову пам'ять)
+      workers — кількість процесів для "numpy" (>1 — пул процесів)
+      tolerance — якщо задано, послідовний режим: зупинка, коли напівширина
+                  95% CI кожної суми < tolerance (п.п.); num_rolls тоді — бюджет кидків
+    Повертає (частоти сум, ймовірності у %, кількість кидків).
+    """
+    if workers < 1:
+        raise ValueError("workers має бути >= 1")
+    sums = sum_range(num_dice, faces)
+    if tolerance is not None:
+        if engine != "numpy" or workers > 1:
+            raise ValueError("Послідовний режим підтримує лише engine='numpy' з workers=1")
+        if tolerance <= 0:
+            raise ValueError("tolerance має бути > 0")
+        counts, num_rolls = _count_sums_adaptive(num_rolls, seed, tolerance, chunk_size, num_dice, faces)
+        sums_count = {s: int(counts[s]) for s in sums}
+    elif engine == "numpy":
+        if workers > 1:
+            counts = _count_sums_parallel(num_rolls, seed, workers, chunk_size, num_dice, faces)
+        else:
+            counts = _count_sums_numpy(num_rolls, seed, chunk_size, num_dice, faces)
+        sums_count = {s: int(counts[s]) for s in sums}
+    elif engine == "loop":
+        sums_count = _count_sums_loop(num_rolls, seed, num_dice, faces)
+    else:
+        raise ValueError("Unknown engine. Use 'numpy' or 'loop'.")
     probabilities = {s: sums_count[s] / num_rolls * 100 for s in sums_count}
     return sums_count, probabilities, num_rolls
 
+
+def benchmark_engines(num_rolls=1_000_000, seed=42, workers=4):
+    """Порівнює час роботи рушіїв "loop", "numpy" і "numpy" з пулом процесів."""
+    print(f"Бенчмарк рушіїв ({num_rolls:,} кидків):")
+    timings = {}
+    runs = [("loop", "loop", 1), ("numpy", "numpy", 1), (f"numpy×{workers}", "numpy", workers)]
+    for label, engine, n_workers in runs:
+        t0 = time.perf_counter()
+        monte_carlo_dice_simulation(num_rolls=num_rolls, seed=seed, engine=engine, workers=n_workers)
+        timings[label] = time.perf_counter() - t0
+        print(f"  {label:>8}: {timings[label]:8.3f} с")
+    print(f"  прискорення: ×{timings['loop'] / timings['numpy']:.1f}")
+    return timings
+
+
 def print_probability_table(mc_probs, n_rolls):
-    an_probs = analytic_probabilities()
+    num_dice, faces = _dice_config(mc_probs)
+    an_probs = analytic_probabilities(num_dice, faces)
     print("| Сума | Монте-Карло, % | Аналітична, % | |Δ|, п.п. | 95% CI (МК)         |")
     print("|----:|---------------:|--------------:|---------:|:--------------------:|")
     mae = 0.0
-    for s in range(2, 13):
+    for s in sum_range(num_dice, faces):
         mc = mc_probs[s]
         an = an_probs[s]
         p = mc / 100.0
         se = math.sqrt(p * (1 - p) * (1 / n_rolls)) * 100
-        ci_lo, ci_hi = mc - 1.96 * se, mc + 1.96 * se
+        ci_lo, ci_hi = mc - Z_95 * se, mc + Z_95 * se
         diff = abs(mc - an)
         mae += diff
         print(f"| {s:4d} | {mc:14.2f} | {an:12.2f} | {diff:9.2f} | [{ci_lo:6.2f}; {ci_hi:6.2f}] |")
-    mae /= 11
+    mae /= len(mc_probs)
     print(f"\nСереднє абсолютне відхилення (МК vs аналітика): {mae:.2f} п.п.")
 
 def plot_probabilities(mc_probs):
-    an_probs = analytic_probabilities()
-    sums = list(range(2, 13))
+    num_dice, faces = _dice_config(mc_probs)
+    an_probs = analytic_probabilities(num_dice, faces)
+    sums = list(sum_range(num_dice, faces))
     mc = [mc_probs[s] for s in sums]
     an = [an_probs[s] for s in sums]
 
@@ -43,14 +229,24 @@ def plot_probabilities(mc_probs):
     plt.bar([s + 0.2 for s in sums], an, width=0.4, label='Аналітичні')
     plt.xlabel('Сума')
     plt.ylabel('Ймовірність (%)')
-    plt.title('Ймовірності сум при киданні двох кубиків')
-    plt.xticks(sums)
+    plt.title(f'Ймовірності сум при киданні {num_dice}d{faces}')
+    if len(sums) <= 40:
+        plt.xticks(sums)
     plt.legend()
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.show()
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_engines()
+        sys.exit(0)
+
     sums_count, probabilities, n = monte_carlo_dice_simulation(num_rolls=1_000_000, seed=42)
     print("Результати симуляції методом Монте-Карло (1,000,000 кидків):")
     print_probability_table(probabilities, n)
+
+    _, adaptive_probs, adaptive_n = monte_carlo_dice_simulation(
+        num_rolls=10_000_000, seed=42, chunk_size=50_000, tolerance=0.1)
+    print(f"\nПослідовний режим (CI ± 0.1 п.п.): зупинка після {adaptive_n:,} кидків")
+    print_probability_table(adaptive_probs, adaptive_n)
     plot_probabilities(probabilities)
@@ -0,0 +1,106 @@
+"""
+Спільний рушій розкладки бінарних дерев для task_4 (купа) і task_5 (обходи).
+
+Вузол у позиції кучі i (корінь — 0, діти — 2i+1 і 2i+2) має глибину d = ⌊log2(i+1)⌋
+і зсув k = i + 1 - 2^d у своєму рівні, тож його координати задаються формулою
+x = (2k + 1) / 2^d - 1, y = -d — та сама розкладка, що й у рекурсивному add_edges,
+але обчислена для всіх вузлів одразу (для довільних дерев — без рекурсії, див. tree_layout).
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# Скільки розкладок кучі (за n) тримати в кеші heap_positions
+LAYOUT_CACHE_SIZE = 32
+
+# Понад стільки вузлів підписи не малюються (вони все одно нечитабельні)
+LABEL_LIMIT = 512
+
+
+class TreeLayout(NamedTuple):
+    """Розкладка дерева: nodes[j] — вузол, pos[j] — (x, y), parent[j] — індекс батька або -1."""
+    nodes: list
+    pos: np.ndarray
+    parent: np.ndarray
+
+
+def slot_positions(depth: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """Координати (n, 2) за глибиною і зсувом у рівні — векторно, без рекурсії."""
+    depth = np.asarray(depth, dtype=np.float64)
+    offset = np.asarray(offset, dtype=np.float64)
+    return np.column_stack([(2 * offset + 1) * np.exp2(-depth) - 1, 0.0 - depth])
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def heap_positions(n: int) -> np.ndarray:
+    """Координати (n, 2) позицій кучі 0..n-1. Кешується за n; масив лише для читання."""
+    idx = np.arange(n, dtype=np.int64) + 1
+    depth = np.floor(np.log2(idx)).astype(np.int64)
+    # виправлення округлення log2 на межах степенів двійки
+    depth -= (np.left_shift(1, depth) > idx)
+    depth += (np.left_shift(1, depth + 1) <= idx)
+    pos = slot_positions(depth, idx - np.left_shift(1, depth))
+    pos.flags.writeable = False
+    return pos
+
+
+def heap_parents(n: int) -> np.ndarray:
+    """Індекс батька для кожної позиції кучі (-1 для кореня)."""
+    parent = (np.arange(n, dtype=np.int64) - 1) // 2
+    if n:
+        parent[0] = -1
+    return parent
+
+
+def tree_layout(root) -> Optional[TreeLayout]:
+    """
+    Розкладка дерева з вузлів із полями left/right: ітеративний обхід у ширину.
+    x дитини = x батька ∓ 2^-(d+1) рахується у float, тож цілий зсув (2^d) не потрібен
+    і дерева будь-якої глибини (навіть вироджені «ланцюжки») не переповнюються.
+    Результат не кешується: обхід і так O(n), тож викликач, що перемальовує те саме
+    дерево, має тримати TreeLayout у себе (як TraversalRenderer).
+    """
+    if root is None:
+        return None
+    nodes = [root]
+    parent: List[int] = [-1]
+    depth: List[int] = [0]
+    xs: List[float] = [0.0]
+    j = 0
+    while j < len(nodes):
+        node = nodes[j]
+        half = 0.5 ** (depth[j] + 1)
+        for dx, child in ((-half, node.left), (half, node.right)):
+            if child is not None:
+                nodes.append(child)
+                parent.append(j)
+                depth.append(depth[j] + 1)
+                xs.append(xs[j] + dx)
+        j += 1
+
+    pos = np.column_stack([np.array(xs), 0.0 - np.array(depth, dtype=np.float64)])
+    return TreeLayout(nodes, pos, np.array(parent, dtype=np.int64))
+
+
+def edge_segments(pos: np.ndarray, parent: np.ndarray) -> np.ndarray:
+    """Відрізки ребер (m, 2, 2) від батька до дитини для LineCollection."""
+    child = np.flatnonzero(parent >= 0)
+    return np.stack([pos[parent[child]], pos[child]], axis=1)
+
+
+def draw_collections(ax, pos: np.ndarray, parent: np.ndarray, colors,
+                     labels: Optional[Sequence] = None, node_size: float = 2500, font_size: int = 10):
+    """
+    Малює дерево двома колекціями matplotlib (LineCollection ребер і scatter вузлів)
+    замість nx.draw. Повертає колекцію вузлів, щоб змінювати кольори без перемальовування.
+    """
+    from matplotlib.collections import LineCollection
+
+    ax.add_collection(LineCollection(edge_segments(pos, parent), colors="black", linewidths=1, zorder=1))
+    nodes = ax.scatter(pos[:, 0], pos[:, 1], s=node_size, c=colors, zorder=2)
+    if labels is not None and len(labels) <= LABEL_LIMIT:
+        for (x, y), label in zip(pos.tolist(), labels):
+            ax.text(x, y, str(label), ha="center", va="center", fontsize=font_size, zorder=3)
+    ax.set_axis_off()
+    return nodes